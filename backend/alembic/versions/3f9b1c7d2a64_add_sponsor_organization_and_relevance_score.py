@@ -0,0 +1,50 @@
+"""Add sponsor organization and relevance score
+
+Revision ID: 3f9b1c7d2a64
+Revises: 7439702bcb9f
+Create Date: 2026-10-17 18:05:12.640218
+
+Sponsors created before this revision belong to no organization. Pass
+``-x sponsor_organization_id=<id>`` to assign them to one; otherwise they
+stay NULL and only organization-less users see them.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9b1c7d2a64'
+down_revision: Union[str, Sequence[str], None] = '7439702bcb9f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("sponsors", sa.Column("organization_id", sa.Integer(), nullable=True))
+    op.create_index("ix_sponsors_organization_id", "sponsors", ["organization_id"])
+    op.add_column("sponsors", sa.Column("relevance_score", sa.Float(), nullable=True))
+
+    # Backfill before NOT NULL: existing sponsors start unscored, as new ones do
+    op.execute("UPDATE sponsors SET relevance_score = 0 WHERE relevance_score IS NULL")
+    organization_id = context.get_x_argument(as_dictionary=True).get("sponsor_organization_id")
+    if organization_id is not None:
+        op.execute(
+            sa.text("UPDATE sponsors SET organization_id = :organization_id WHERE organization_id IS NULL")
+            .bindparams(organization_id=int(organization_id))
+        )
+
+    # SQLite cannot ALTER COLUMN; batch mode copies the table there
+    with op.batch_alter_table("sponsors") as batch_op:
+        batch_op.alter_column("relevance_score", existing_type=sa.Float(), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("sponsors") as batch_op:
+        batch_op.drop_column("relevance_score")
+    op.drop_index("ix_sponsors_organization_id", table_name="sponsors")
+    with op.batch_alter_table("sponsors") as batch_op:
+        batch_op.drop_column("organization_id")
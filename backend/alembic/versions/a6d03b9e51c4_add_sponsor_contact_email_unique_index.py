@@ -0,0 +1,37 @@
+"""Add sponsor contact email unique index
+
+Revision ID: a6d03b9e51c4
+Revises: e2b95c714f08
+Create Date: 2026-10-17 16:41:07.553218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d03b9e51c4'
+down_revision: Union[str, Sequence[str], None] = 'e2b95c714f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # create_sponsor already refuses duplicates, but only by check-then-insert.
+    # The build fails (leaving an INVALID index to drop) if duplicates slipped in.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_sponsors_org_contact_email", "sponsors", ["organization_id", "contact_email"],
+            unique=True, if_not_exists=True, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "uq_sponsors_org_contact_email", table_name="sponsors", if_exists=True, postgresql_concurrently=True
+        )
@@ -0,0 +1,36 @@
+"""Add organizations
+
+Revision ID: b7e4f05a9c12
+Revises: a6d03b9e51c4
+Create Date: 2026-10-17 18:20:44.105873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4f05a9c12'
+down_revision: Union[str, Sequence[str], None] = 'a6d03b9e51c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "organizations",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_organizations_id", "organizations", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_organizations_id", table_name="organizations")
+    op.drop_table("organizations")
@@ -0,0 +1,62 @@
+"""Add listing and search indexes
+
+Revision ID: c81f4e2a9d37
+Revises: 3f9b1c7d2a64
+Create Date: 2026-10-17 10:12:40.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f4e2a9d37'
+down_revision: Union[str, Sequence[str], None] = '3f9b1c7d2a64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name -> (table, columns), matching the keyset sort keys of the list endpoints
+COMPOSITE_INDEXES = {
+    # list_sponsors: WHERE organization_id = ? ORDER BY relevance_score DESC, id DESC
+    "ix_sponsors_org_relevance": (
+        "sponsors", ["organization_id", sa.text("relevance_score DESC"), sa.text("id DESC")]
+    ),
+    # get_user_activity: WHERE user_id = ? ORDER BY timestamp DESC, id DESC
+    # (the organization feed has its own index, from migration a9d5e2f41c73)
+    "ix_activity_logs_user_timestamp": (
+        "activity_logs", ["user_id", sa.text("timestamp DESC"), sa.text("id DESC")]
+    ),
+}
+
+# list_sponsors ?search= runs name ILIKE '%...%', which no btree can serve
+TRGM_INDEX = "ix_sponsors_name_trgm"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block. A
+    # concurrent build that fails leaves an INVALID index behind: drop it
+    # and rerun the upgrade.
+    with op.get_context().autocommit_block():
+        for name, (table, columns) in COMPOSITE_INDEXES.items():
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+        if is_postgres:
+            op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            op.create_index(
+                TRGM_INDEX, "sponsors", ["name"],
+                if_not_exists=True,
+                postgresql_using="gin",
+                postgresql_ops={"name": "gin_trgm_ops"},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(TRGM_INDEX, table_name="sponsors", if_exists=True, postgresql_concurrently=True)
+        for name, (table, _) in COMPOSITE_INDEXES.items():
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
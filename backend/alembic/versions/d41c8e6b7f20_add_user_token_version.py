@@ -0,0 +1,35 @@
+"""Add user token version
+
+Revision ID: d41c8e6b7f20
+Revises: b7e4f05a9c12
+Create Date: 2026-10-17 18:48:31.220417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41c8e6b7f20'
+down_revision: Union[str, Sequence[str], None] = 'b7e4f05a9c12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("users", sa.Column("token_version", sa.Integer(), nullable=True))
+    # Backfill before NOT NULL: tokens issued before this revision carry no
+    # `ver`, which the token checks accept at any version
+    op.execute("UPDATE users SET token_version = 0 WHERE token_version IS NULL")
+    # SQLite cannot ALTER COLUMN; batch mode copies the table there
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.alter_column("token_version", existing_type=sa.Integer(), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("token_version")
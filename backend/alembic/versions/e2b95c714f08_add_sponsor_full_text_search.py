@@ -0,0 +1,91 @@
+"""Add sponsor full-text search
+
+Revision ID: e2b95c714f08
+Revises: c81f4e2a9d37
+Create Date: 2026-10-17 14:03:55.902617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b95c714f08'
+down_revision: Union[str, Sequence[str], None] = 'c81f4e2a9d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SQLITE_TRIGGERS = {
+    "sponsors_fts_insert": """
+        CREATE TRIGGER sponsors_fts_insert AFTER INSERT ON sponsors BEGIN
+            INSERT INTO sponsors_fts(rowid, name, industry, notes) VALUES (new.id, new.name, new.industry, new.notes);
+        END
+    """,
+    "sponsors_fts_delete": """
+        CREATE TRIGGER sponsors_fts_delete AFTER DELETE ON sponsors BEGIN
+            INSERT INTO sponsors_fts(sponsors_fts, rowid, name, industry, notes)
+            VALUES ('delete', old.id, old.name, old.industry, old.notes);
+        END
+    """,
+    "sponsors_fts_update": """
+        CREATE TRIGGER sponsors_fts_update AFTER UPDATE OF name, industry, notes ON sponsors BEGIN
+            INSERT INTO sponsors_fts(sponsors_fts, rowid, name, industry, notes)
+            VALUES ('delete', old.id, old.name, old.industry, old.notes);
+            INSERT INTO sponsors_fts(rowid, name, industry, notes) VALUES (new.id, new.name, new.industry, new.notes);
+        END
+    """,
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        op.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS sponsors_fts USING fts5(
+                name, industry, notes, content='sponsors', content_rowid='id', tokenize='porter unicode61'
+            )
+        """)
+        for name, statement in SQLITE_TRIGGERS.items():
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+            op.execute(statement)
+        op.execute("INSERT INTO sponsors_fts(sponsors_fts) VALUES ('rebuild')")
+        return
+
+    # Adding a stored generated column rewrites the table under an exclusive
+    # lock; run this in a quiet window on large tables.
+    op.execute("""
+        ALTER TABLE sponsors ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(industry, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(notes, '')), 'C')
+        ) STORED
+    """)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_sponsors_search_vector", "sponsors", ["search_vector"],
+            if_not_exists=True, postgresql_using="gin", postgresql_concurrently=True,
+        )
+        # ?search= no longer runs ILIKE on name
+        op.drop_index("ix_sponsors_name_trgm", table_name="sponsors", if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        for name in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute("DROP TABLE IF EXISTS sponsors_fts")
+        return
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_sponsors_name_trgm", "sponsors", ["name"],
+            if_not_exists=True,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_sponsors_search_vector", table_name="sponsors", if_exists=True, postgresql_concurrently=True)
+    op.execute("ALTER TABLE sponsors DROP COLUMN IF EXISTS search_vector")
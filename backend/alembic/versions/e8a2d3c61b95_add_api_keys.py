@@ -0,0 +1,46 @@
+"""Add api keys
+
+Revision ID: e8a2d3c61b95
+Revises: d41c8e6b7f20
+Create Date: 2026-10-17 19:02:17.584930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a2d3c61b95'
+down_revision: Union[str, Sequence[str], None] = 'd41c8e6b7f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "api_keys",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("prefix", sa.String(length=16), nullable=False),
+        sa.Column("key_hash", sa.String(length=64), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("organization_id", sa.Integer(), nullable=True),
+        sa.Column("role", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_api_keys_id", "api_keys", ["id"])
+    # Keys are looked up by their public prefix on every request
+    op.create_index("ix_api_keys_prefix", "api_keys", ["prefix"], unique=True)
+    op.create_index("ix_api_keys_organization_id", "api_keys", ["organization_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_api_keys_organization_id", table_name="api_keys")
+    op.drop_index("ix_api_keys_prefix", table_name="api_keys")
+    op.drop_index("ix_api_keys_id", table_name="api_keys")
+    op.drop_table("api_keys")
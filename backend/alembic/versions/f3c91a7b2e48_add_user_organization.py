@@ -0,0 +1,46 @@
+"""Add user organization
+
+Revision ID: f3c91a7b2e48
+Revises: e8a2d3c61b95
+Create Date: 2026-10-17 19:31:06.418275
+
+Users created before this revision belong to no organization. Pass
+``-x user_organization_id=<id>`` (an existing organizations row) to assign
+them to one; otherwise they stay NULL and see only organization-less
+sponsors and users.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c91a7b2e48'
+down_revision: Union[str, Sequence[str], None] = 'e8a2d3c61b95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite cannot add a foreign key to an existing table; batch mode copies the table there
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(sa.Column("organization_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key("fk_users_organization_id", "organizations", ["organization_id"], ["id"])
+        batch_op.create_index("ix_users_organization_id", ["organization_id"])
+
+    organization_id = context.get_x_argument(as_dictionary=True).get("user_organization_id")
+    if organization_id is not None:
+        op.execute(
+            sa.text("UPDATE users SET organization_id = :organization_id WHERE organization_id IS NULL")
+            .bindparams(organization_id=int(organization_id))
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_index("ix_users_organization_id")
+        batch_op.drop_constraint("fk_users_organization_id", type_="foreignkey")
+        batch_op.drop_column("organization_id")
@@ -0,0 +1,239 @@
+# app/ai_engine/ann.py
+
+import threading
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+from app.ai_engine.ranking import top_k
+from app.ai_engine.vector_index import TOMBSTONE
+
+
+def _kmeans(data: np.ndarray, k: int, iterations: int, rng: np.random.Generator) -> np.ndarray:
+    """Plain Lloyd's k-means (squared L2) over `data`; returns (k, d) centroids."""
+    centroids = data[rng.choice(len(data), size=k, replace=False)].astype(np.float32)
+    for _ in range(iterations):
+        assignment = _nearest(data, centroids)
+        order = np.argsort(assignment, kind="stable")
+        counts = np.bincount(assignment, minlength=k)
+        filled = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[filled]
+        centroids[filled] = np.add.reduceat(data[order], starts, axis=0) / counts[filled, None]
+        # Re-seed empty clusters from random points so k stays meaningful
+        empty = np.flatnonzero(counts == 0)
+        centroids[empty] = data[rng.choice(len(data), size=len(empty))]
+    return centroids
+
+
+def _nearest(data: np.ndarray, centroids: np.ndarray, chunk: int = 65536) -> np.ndarray:
+    """Index of the nearest centroid (squared L2) for every row of `data`."""
+    centroid_norms = (centroids * centroids).sum(axis=1)
+    out = np.empty(len(data), dtype=np.int64)
+    for start in range(0, len(data), chunk):
+        block = data[start:start + chunk]
+        out[start:start + chunk] = np.argmin(centroid_norms - 2.0 * block @ centroids.T, axis=1)
+    return out
+
+
+class IVFPQIndex:
+    """
+    Inverted-file index with product-quantized residuals, for inner-product search.
+
+    Vectors are bucketed by a coarse k-means (``nlist`` lists). The residual
+    to the list centroid is split into ``m`` sub-vectors, each encoded as one
+    byte against a 256-entry codebook. A query scores only the ``nprobe``
+    closest lists, using one (m, 256) lookup table shared by every list since
+    ``<q, c + r> = <q, c> + sum_j <q_j, r_j>``. The best ``rerank`` candidates
+    are then re-scored exactly against the original vectors.
+
+    ``nprobe`` is the recall/latency knob: more lists scanned, better recall.
+    """
+
+    def __init__(self, ids: np.ndarray, vectors: np.ndarray, nlist: int = 0, m: int = 32,
+                 iterations: int = 10, train_size: int = 65536, pq_train_size: int = 16384, seed: int = 0):
+        n, dim = vectors.shape
+        if dim % m:
+            raise ValueError(f"Vector dim {dim} is not divisible by m={m}")
+        rng = np.random.default_rng(seed)
+        self.ids = ids
+        self.vectors = vectors
+        self.m = m
+        self.nlist = min(nlist or max(1, int(np.sqrt(n))), max(n, 1))
+
+        sample = np.asarray(vectors[rng.choice(n, size=min(n, train_size), replace=False)], dtype=np.float32)
+        self.centroids = _kmeans(sample, self.nlist, iterations, rng)
+
+        # Residual codebooks: (m, ksub, dsub)
+        self.dsub = dim // m
+        ksub = min(256, len(sample), pq_train_size)
+        residuals = sample[:pq_train_size] - self.centroids[_nearest(sample[:pq_train_size], self.centroids)]
+        self.codebooks = np.stack([
+            _kmeans(residuals[:, j * self.dsub:(j + 1) * self.dsub], ksub, iterations, rng)
+            for j in range(m)
+        ])
+
+        # Encode every vector, then lay the lists out contiguously by list id
+        assignment = _nearest(vectors, self.centroids)
+        codes = np.empty((n, m), dtype=np.uint8)
+        for start in range(0, n, 65536):
+            block = np.asarray(vectors[start:start + 65536], dtype=np.float32)
+            block = block - self.centroids[assignment[start:start + 65536]]
+            for j in range(m):
+                codes[start:start + len(block), j] = _nearest(block[:, j * self.dsub:(j + 1) * self.dsub], self.codebooks[j])
+        order = np.argsort(assignment, kind="stable")
+        self.rows = order
+        # (m, n) so each sub-quantizer's codes for a probed list are one gather
+        self.codes = np.ascontiguousarray(codes[order].T)
+        self.offsets = np.searchsorted(assignment[order], np.arange(self.nlist + 1))
+        self.size = n
+
+    def remap(self, ids: np.ndarray, vectors: np.ndarray):
+        """Point re-scoring at fresh views of the same rows (e.g. after the file grew)."""
+        self.ids = ids
+        self.vectors = vectors
+
+    def search(self, query: np.ndarray, k: int, nprobe: int = 16, rerank: int = 100,
+               sponsor_ids: Optional[np.ndarray] = None,
+               skip_rows: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-k by inner product; returns (sponsor ids, scores), best first.
+
+        With `sponsor_ids`, rows of other sponsors in the probed lists
+        are dropped before the shortlist is taken, as are `skip_rows`
+        (rows whose codes are stale and which the caller scores itself).
+        """
+        query = query.astype(np.float32, copy=False)
+        coarse = self.centroids @ query
+        nprobe = min(nprobe, self.nlist)
+        probed = np.argpartition(-coarse, nprobe - 1)[:nprobe]
+
+        spans = [np.arange(self.offsets[l], self.offsets[l + 1]) for l in probed]
+        positions = np.concatenate(spans) if spans else np.zeros(0, np.int64)
+        if not len(positions):
+            return np.zeros(0, np.int64), np.zeros(0, np.float32)
+
+        lut = np.einsum("jkd,jd->jk", self.codebooks, query.reshape(self.m, self.dsub))
+        list_of_position = np.repeat(probed, [len(span) for span in spans])
+        if sponsor_ids is not None or skip_rows is not None:
+            allowed = np.ones(len(positions), dtype=bool)
+            if sponsor_ids is not None:
+                allowed &= np.isin(self.ids[self.rows[positions]], sponsor_ids)
+            if skip_rows is not None:
+                allowed &= ~np.isin(self.rows[positions], skip_rows)
+            positions, list_of_position = positions[allowed], list_of_position[allowed]
+            if not len(positions):
+                return np.zeros(0, np.int64), np.zeros(0, np.float32)
+        approx = coarse[list_of_position]
+        codes = self.codes[:, positions]
+        for j in range(self.m):
+            approx += lut[j][codes[j]]
+
+        shortlist = min(max(rerank, k), len(positions))
+        best = np.argpartition(-approx, shortlist - 1)[:shortlist]
+        rows = self.rows[positions[best]]
+
+        # Exact re-score against the live mmap; tombstoned rows drop out here
+        ids = self.ids[rows]
+        live = ids != TOMBSTONE
+        rows, ids = rows[live], ids[live]
+        scores = np.asarray(self.vectors[rows]) @ query
+        top = top_k(scores, k)
+        return ids[top], scores[top]
+
+    def measure_recall(self, queries: np.ndarray, k: int = 10, nprobe: int = 16, rerank: int = 100) -> dict:
+        """
+        Compare ANN results with exact brute-force top-k for `queries`.
+
+        Returns recall@k (fraction of the exact top-k ids the ANN path also
+        returned) and p50/p99 latency of both paths in milliseconds.
+        """
+        live = self.ids[:self.size] != TOMBSTONE
+        exact_ids = self.ids[:self.size][live]
+        exact_vectors = self.vectors[:self.size]
+        ann_ms, exact_ms, hits = [], [], 0
+        for query in queries:
+            start = time.perf_counter()
+            found, _ = self.search(query, k, nprobe=nprobe, rerank=rerank)
+            ann_ms.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            scores = (exact_vectors @ query)[live]
+            top = top_k(scores, k)
+            exact_ms.append((time.perf_counter() - start) * 1000)
+
+            hits += len(np.intersect1d(found, exact_ids[top]))
+        expected = len(queries) * min(k, int(live.sum()))
+        return {
+            "k": k,
+            "nprobe": nprobe,
+            "rerank": rerank,
+            "recall": hits / expected if expected else 1.0,
+            "ann_p50_ms": float(np.percentile(ann_ms, 50)),
+            "ann_p99_ms": float(np.percentile(ann_ms, 99)),
+            "exact_p50_ms": float(np.percentile(exact_ms, 50)),
+            "exact_p99_ms": float(np.percentile(exact_ms, 99)),
+        }
+
+
+class ANNCache:
+    """
+    Per-process IVF-PQ index over the shared sponsor vector index.
+
+    Rows appended after the build, and rows overwritten in place since (whose
+    PQ codes and list assignment are stale), are scored exactly as a small
+    tail. The IVF-PQ structure is rebuilt once the tail exceeds ``max_tail``
+    of the indexed rows or the vector index renumbers its rows.
+    """
+
+    def __init__(self, max_tail: float = 0.1):
+        self.max_tail = max_tail
+        self._lock = threading.Lock()
+        self._ann: Optional[IVFPQIndex] = None
+        self._epoch = None
+        self._updates_seen = 0
+
+    def get(self, vector_index, nlist: int, m: int) -> Tuple[IVFPQIndex, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Current IVF-PQ index, fresh (ids, vectors) views of the vector index
+        and the built rows overwritten since the build.
+        """
+        with self._lock:
+            epoch = vector_index.epoch
+            ids, vectors = vector_index.snapshot()
+            updated = vector_index.updated_rows()
+            stale = self._ann is None or epoch != self._epoch
+            if not stale:
+                changed = np.unique(np.asarray(updated[self._updates_seen:], dtype=np.int64))
+                changed = changed[changed < self._ann.size]
+                tail = len(ids) - self._ann.size + len(changed)
+                stale = tail > self.max_tail * max(self._ann.size, 1)
+            if stale:
+                self._ann = IVFPQIndex(ids, vectors, nlist=nlist, m=m)
+                self._epoch = epoch
+                self._updates_seen = len(updated)
+                changed = np.zeros(0, dtype=np.int64)
+            else:
+                self._ann.remap(ids, vectors)
+            return self._ann, ids, vectors, changed
+
+    def search(self, vector_index, query: np.ndarray, k: int, nlist: int, m: int,
+               nprobe: int, rerank: int, sponsor_ids: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        ann, all_ids, vectors, changed = self.get(vector_index, nlist, m)
+        ids, scores = ann.search(
+            query, k, nprobe=nprobe, rerank=rerank, sponsor_ids=sponsor_ids, skip_rows=changed if len(changed) else None
+        )
+
+        tail = np.concatenate([changed, np.arange(ann.size, len(all_ids))])
+        if len(tail):
+            tail_ids = all_ids[tail]
+            if sponsor_ids is None:
+                live = np.flatnonzero(tail_ids != TOMBSTONE)
+            else:
+                live = np.flatnonzero(np.isin(tail_ids, sponsor_ids))
+            tail_scores = np.asarray(vectors[tail[live]]) @ query
+            ids = np.concatenate([ids, tail_ids[live]])
+            scores = np.concatenate([scores, tail_scores])
+            top = top_k(scores, k)
+            ids, scores = ids[top], scores[top]
+        return ids, scores
@@ -0,0 +1,156 @@
+# app/ai_engine/embedding_service.py
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Iterable, List
+
+import numpy as np
+
+from app.ai_engine.embeddings import HashingEmbedder, SentenceTransformerEmbedder
+from app.config import settings
+from app.core.metrics import Histogram
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class _Pending:
+    __slots__ = ("texts", "future", "enqueued_at")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class EmbeddingService:
+    """
+    In-process embedding runtime with dynamic micro-batching.
+
+    Callers (the /match handlers and sponsor writes, on Starlette's threadpool)
+    block on ``embed``. A single batcher thread drains the queue: it waits up
+    to ``max_wait_ms`` after the first queued request for others to arrive,
+    up to ``max_batch_size`` texts, and runs them through the model in one
+    forward pass. The model is loaded lazily, once per worker process.
+
+    Inputs that already fill a batch bypass the queue and run directly.
+    """
+
+    def __init__(self, loader: Callable[[], object], max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._loader = loader
+        self._backend = None
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[_Pending]" = queue.Queue()
+        self._thread: threading.Thread | None = None
+
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.latency_ms = Histogram()
+        self.forward_ms = Histogram()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = self._loader()
+        return self._backend
+
+    @property
+    def dim(self) -> int:
+        return self.backend.dim
+
+    def embed(self, texts: Iterable[str]) -> np.ndarray:
+        """Embeddings for `texts` as a (len(texts), dim) float32 array."""
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        if len(texts) >= self.max_batch_size:
+            start = time.perf_counter()
+            vectors = self._forward(texts)
+            self.latency_ms.observe((time.perf_counter() - start) * 1000)
+            return vectors
+
+        self._ensure_started()
+        pending = _Pending(texts)
+        self._queue.put(pending)
+        return pending.future.result()
+
+    def embed_one(self, text: str) -> np.ndarray:
+        return self.embed([text])[0]
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self._backend).__name__ if self._backend is not None else None,
+            "queue_depth": self._queue.qsize(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batch_size": self.batch_sizes.snapshot(),
+            "latency_ms": self.latency_ms.snapshot(),
+            "forward_ms": self.forward_ms.snapshot(),
+        }
+
+    # ---------- Batching ----------
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                    self._thread.start()
+
+    def _forward(self, texts: List[str]) -> np.ndarray:
+        start = time.perf_counter()
+        vectors = np.asarray(self.backend.embed(texts), dtype=np.float32)
+        self.forward_ms.observe((time.perf_counter() - start) * 1000)
+        self.batch_sizes.observe(len(texts))
+        return vectors
+
+    def _collect(self) -> List[_Pending]:
+        batch = [self._queue.get()]
+        size = len(batch[0].texts)
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                pending = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(pending)
+            size += len(pending.texts)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                vectors = self._forward([text for pending in batch for text in pending.texts])
+            except Exception as exc:
+                for pending in batch:
+                    pending.future.set_exception(exc)
+                continue
+
+            offset = 0
+            done = time.perf_counter()
+            for pending in batch:
+                pending.future.set_result(vectors[offset:offset + len(pending.texts)])
+                offset += len(pending.texts)
+                self.latency_ms.observe((done - pending.enqueued_at) * 1000)
+
+
+def load_embedder():
+    """Build the configured embedding backend (called lazily, once per worker)."""
+    if settings.embedding_backend == "sentence-transformers":
+        return SentenceTransformerEmbedder(settings.embedding_model, settings.huggingface_token)
+    return HashingEmbedder(settings.sponsor_index_dim)
+
+
+embedding_service = EmbeddingService(
+    load_embedder,
+    max_batch_size=settings.embedding_max_batch_size,
+    max_wait_ms=settings.embedding_max_wait_ms,
+)
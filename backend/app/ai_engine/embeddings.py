@@ -0,0 +1,69 @@
+# app/ai_engine/embeddings.py
+
+import math
+import zlib
+from collections import Counter
+from typing import Iterable, Optional
+
+import numpy as np
+
+from app.ai_engine.tfidf import tokenize
+
+
+class HashingEmbedder:
+    """
+    Deterministic fixed-width text embedding using signed feature hashing.
+
+    Every worker produces identical vectors for identical text without any
+    shared vocabulary, which is what lets the on-disk index be appended to
+    from any process.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token, count in Counter(tokenize(text)).items():
+            digest = zlib.crc32(token.encode("utf-8"))
+            sign = 1.0 if digest & 0x80000000 else -1.0
+            vector[digest % self.dim] += sign * (1.0 + math.log(count))
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def embed(self, texts: Iterable[str]) -> np.ndarray:
+        rows = [self.embed_one(text) for text in texts]
+        if not rows:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack(rows)
+
+
+class SentenceTransformerEmbedder:
+    """
+    Local CPU sentence-transformers model.
+
+    ``sentence-transformers`` is an optional dependency and is only imported
+    when this backend is selected.
+    """
+
+    def __init__(self, model_name: str, token: Optional[str] = None):
+        from sentence_transformers import SentenceTransformer
+
+        # The placeholder token in Settings would make the hub reject public models
+        if token and token.startswith("your-"):
+            token = None
+        self.model = SentenceTransformer(model_name, device="cpu", token=token)
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed_one(self, text: str) -> np.ndarray:
+        return self.embed([text])[0]
+
+    def embed(self, texts: Iterable[str]) -> np.ndarray:
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return self.model.encode(
+            texts, batch_size=len(texts), normalize_embeddings=True, convert_to_numpy=True
+        ).astype(np.float32)
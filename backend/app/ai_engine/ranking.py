@@ -0,0 +1,21 @@
+# app/ai_engine/ranking.py
+
+from typing import Optional
+
+import numpy as np
+
+
+def top_k(scores: np.ndarray, k: Optional[int]) -> np.ndarray:
+    """
+    Positions of the `k` highest scores, best first (ties by position).
+
+    Uses argpartition, so only the k winners are sorted: O(n + k log k)
+    instead of sorting all n scores. ``k=None`` ranks every score.
+    """
+    n = len(scores)
+    if k is None or k >= n:
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    winners = np.argpartition(-scores, k - 1)[:k]
+    return winners[np.lexsort((winners, -scores[winners]))]
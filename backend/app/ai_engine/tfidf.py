@@ -0,0 +1,167 @@
+# app/ai_engine/tfidf.py
+
+import math
+import re
+from collections import Counter
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in",
+    "is", "it", "of", "on", "or", "our", "the", "to", "we", "with", "you",
+})
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase and split text into normalized tokens."""
+    if not text:
+        return []
+    return [
+        token for token in TOKEN_RE.findall(text.lower())
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+def sponsor_document(name: Optional[str], industry: Optional[str], notes: Optional[str]) -> str:
+    """Text a sponsor is indexed under."""
+    return " ".join(part for part in (name, industry, notes) if part)
+
+
+def request_document(request) -> str:
+    """Text a SponsorMatchRequest is scored with."""
+    parts = [request.event_name, request.event_theme, request.description]
+    parts.extend(request.keywords or [])
+    return " ".join(part for part in parts if part)
+
+
+class TfidfIndex:
+    """
+    Sparse TF-IDF matrix over a fixed set of sponsor documents.
+
+    Rows are L2-normalized, so scoring a query is a single CSR
+    matrix-vector product that yields cosine similarities.
+
+    The same matrix in CSC layout is the inverted index: column ``t`` lists
+    the documents containing token ``t``. Selective queries are scored from
+    those posting lists alone (see ``score_candidates``).
+    """
+
+    def __init__(self, ids: Sequence[int], documents: Iterable[str]):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.vocabulary: dict[str, int] = {}
+
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for document in documents:
+            counts = Counter(tokenize(document))
+            for token, count in counts.items():
+                indices.append(self.vocabulary.setdefault(token, len(self.vocabulary)))
+                data.append(1.0 + math.log(count))
+            indptr.append(len(indices))
+
+        n_docs = len(indptr) - 1
+        matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(n_docs, len(self.vocabulary)),
+        )
+
+        df = np.bincount(matrix.indices, minlength=len(self.vocabulary))
+        self.idf = (np.log((1.0 + n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+
+        matrix.data *= self.idf[matrix.indices]
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        matrix.data /= np.repeat(norms, np.diff(matrix.indptr)).astype(np.float32)
+        self.matrix = matrix
+        self.postings = matrix.tocsc()
+        self.terms = np.array(list(self.vocabulary), dtype=object)
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def query_terms(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Vocabulary columns of the query's known tokens and their normalized weights."""
+        columns, weights = [], []
+        for token, count in Counter(tokenize(text)).items():
+            column = self.vocabulary.get(token)
+            if column is not None:
+                columns.append(column)
+                weights.append((1.0 + math.log(count)) * self.idf[column])
+        columns = np.asarray(columns, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float32)
+        norm = np.linalg.norm(weights)
+        if norm > 0:
+            weights /= norm
+        return columns, weights
+
+    def query_vector(self, text: str) -> np.ndarray:
+        """Dense, L2-normalized TF-IDF weights for a query over this vocabulary."""
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        columns, weights = self.query_terms(text)
+        vector[columns] = weights
+        return vector
+
+    def score_candidates(self, text: str, max_candidates: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Scores of only the documents sharing at least one token with `text`.
+
+        Walks the query terms' posting lists instead of every row; every other
+        document scores exactly 0. Returns (rows, scores) with rows ascending,
+        or None when the posting lists hold more than `max_candidates` entries
+        and a full matrix-vector product would be cheaper.
+        """
+        columns, weights = self.query_terms(text)
+        indptr, indices, data = self.postings.indptr, self.postings.indices, self.postings.data
+        if int((indptr[columns + 1] - indptr[columns]).sum()) > max_candidates:
+            return None
+        spans = [slice(indptr[column], indptr[column + 1]) for column in columns]
+        if not spans:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        rows = np.concatenate([indices[span] for span in spans])
+        contributions = np.concatenate([data[span] * weight for span, weight in zip(spans, weights)])
+        candidates, inverse = np.unique(rows, return_inverse=True)
+        return candidates, np.bincount(inverse, weights=contributions).astype(np.float32)
+
+    def explain(self, text: str, rows: np.ndarray, n: int = 3) -> List[List[Tuple[str, float]]]:
+        """
+        Top `n` terms behind each of `rows`' scores for `text`, with weights.
+
+        A document's cosine score is the sum over shared terms of query weight
+        x document weight, so the per-term contributions come straight from
+        the already-built matrix rows: one small (rows x query terms) slice
+        for all hits, with no text re-comparison. Weights sum to the score.
+        """
+        columns, weights = self.query_terms(text)
+        if len(rows) == 0 or len(columns) == 0:
+            return [[] for _ in range(len(rows))]
+        contributions = self.matrix[rows][:, columns].toarray() * weights
+        order = np.argsort(-contributions, axis=1, kind="stable")[:, :n]
+        top = np.take_along_axis(contributions, order, axis=1)
+        terms = self.terms[columns][order]
+        return [
+            [(term, float(weight)) for term, weight in zip(row_terms, row_weights) if weight > 0]
+            for row_terms, row_weights in zip(terms, top)
+        ]
+
+    def score(self, text: str) -> np.ndarray:
+        """Cosine similarity of every indexed document to `text`."""
+        if len(self) == 0:
+            return np.zeros(0, dtype=np.float32)
+        return self.matrix @ self.query_vector(text)
+
+    def score_many(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Cosine similarities for several queries at once: (n_docs, n_queries).
+
+        One sparse x dense product walks the sponsor matrix a single time for
+        the whole batch instead of once per query.
+        """
+        if len(self) == 0 or not texts:
+            return np.zeros((len(self), len(texts)), dtype=np.float32)
+        queries = np.stack([self.query_vector(text) for text in texts], axis=1)
+        return self.matrix @ queries
@@ -0,0 +1,334 @@
+# app/ai_engine/vector_index.py
+
+import fcntl
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from app.config import settings
+
+TOMBSTONE = -1
+MIN_CAPACITY = 1024
+# In-place overwrites logged per epoch before a compaction starts a new one
+MAX_UPDATE_LOG = 8192
+
+
+class SponsorVectorIndex:
+    """
+    On-disk sponsor vector matrix shared by every worker through mmap.
+
+    Layout of the index directory:
+
+    - ``v<N>/vectors.npy``: float32 (capacity, dim) matrix, one row per sponsor
+    - ``v<N>/ids.npy``: int64 (capacity,) row -> sponsor id map, ``-1`` for
+      tombstoned or unused rows
+    - ``meta.json``: the current ``v<N>`` directory, number of rows in use,
+      live rows, a version counter and an epoch that changes whenever rows
+      are renumbered
+    - ``updates-<epoch>.log``: int64 rows overwritten in place during the
+      epoch, appended to and never rewritten
+
+    Writers serialize on an flock and update rows in place, so readers that
+    already mapped the files see new vectors without copying anything. An
+    in-place overwrite only appends to the update log, leaving ``meta.json``
+    (and so every reader's mapping) alone. When
+    the matrix grows or is compacted both arrays are written to a new
+    ``v<N>`` directory and swapped in together by the ``os.replace`` of
+    ``meta.json``, so a reader never pairs one generation's vectors with
+    another's ids; readers notice the new ``meta.json`` and remap.
+    """
+
+    def __init__(self, path: str, dim: int):
+        self.path = path
+        self.dim = dim
+        self._lock = threading.Lock()
+        self._meta_stat: Optional[Tuple[int, int]] = None
+        self._meta = {"dim": dim, "size": 0, "live": 0, "version": 0, "epoch": 0}
+        self._vectors: Optional[np.memmap] = None
+        self._ids: Optional[np.memmap] = None
+        # sponsor id -> row, built on first write after each remap
+        self._row_of: Optional[Dict[int, int]] = None
+        self._retired: List[str] = []
+        os.makedirs(path, exist_ok=True)
+
+    # ---------- Files ----------
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _update_log(self) -> str:
+        return self._file(f"updates-{self._meta.get('epoch', 0)}.log")
+
+    @contextmanager
+    def _write_lock(self):
+        with self._lock, open(self._file("index.lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh(mode="r+")
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_meta(self):
+        self._meta["version"] += 1
+        tmp = self._file("meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._meta, f)
+        os.replace(tmp, self._file("meta.json"))
+        # Our own write (we hold the flock): the mapped arrays are current
+        st = os.stat(self._file("meta.json"))
+        self._meta_stat = (st.st_ino, st.st_mtime_ns)
+        # Readers still mapping a retired generation keep it until they remap
+        for name in self._retired:
+            if os.path.isdir(self._file(name)):
+                shutil.rmtree(self._file(name), ignore_errors=True)
+            elif os.path.exists(self._file(name)):
+                os.remove(self._file(name))
+        self._retired = []
+
+    def _write_arrays(self, vectors: np.ndarray, ids: np.ndarray, capacity: int):
+        """
+        Write both arrays, with `capacity` rows, to a new generation directory.
+
+        It becomes visible to other processes with the next ``_write_meta``.
+        """
+        data = f"v{self._meta['version'] + 1}"
+        os.makedirs(self._file(data), exist_ok=True)
+        new_vectors = open_memmap(
+            os.path.join(self._file(data), "vectors.npy"), mode="w+", dtype=np.float32, shape=(capacity, self.dim)
+        )
+        new_ids = open_memmap(os.path.join(self._file(data), "ids.npy"), mode="w+", dtype=np.int64, shape=(capacity,))
+        new_vectors[:len(vectors)] = vectors
+        new_ids[:] = TOMBSTONE
+        new_ids[:len(ids)] = ids
+        new_vectors.flush()
+        new_ids.flush()
+        if self._vectors is not None:
+            self._retired.append(self._meta.get("data", ""))
+        self._meta["data"] = data
+        self._vectors, self._ids = new_vectors, new_ids
+
+    def _refresh(self, mode: str = "r"):
+        """Remap the arrays if another process swapped them since the last call."""
+        while True:
+            try:
+                st = os.stat(self._file("meta.json"))
+            except FileNotFoundError:
+                if mode == "r+" and self._vectors is None:
+                    self._write_arrays(np.zeros((0, self.dim), np.float32), np.zeros(0, np.int64), MIN_CAPACITY)
+                    self._write_meta()
+                return
+            stat_key = (st.st_ino, st.st_mtime_ns)
+            if stat_key == self._meta_stat and (mode == "r" or self._vectors.mode != "r"):
+                return
+            with open(self._file("meta.json")) as f:
+                meta = json.load(f)
+            if meta["dim"] != self.dim:
+                raise ValueError(f"Sponsor index at {self.path} has dim {meta['dim']}, expected {self.dim}")
+            data = self._file(meta.get("data", ""))
+            try:
+                vectors = np.load(os.path.join(data, "vectors.npy"), mmap_mode=mode)
+                ids = np.load(os.path.join(data, "ids.npy"), mmap_mode=mode)
+            except FileNotFoundError:
+                continue  # a writer retired that generation after we read meta.json
+            self._vectors, self._ids = vectors, ids
+            self._meta = meta
+            self._meta_stat = stat_key
+            self._row_of = None
+            return
+
+    # ---------- Reads ----------
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return self._meta["live"]
+
+    @property
+    def epoch(self) -> int:
+        """Bumped by compaction and rebuilds, which renumber rows."""
+        with self._lock:
+            self._refresh()
+            return self._meta.get("epoch", 0)
+
+    def updated_rows(self) -> List[int]:
+        """
+        Rows overwritten in place since the epoch began, oldest first.
+
+        Structures derived from the vectors (e.g. IVF-PQ codes) use it to find
+        rows that changed after they were built.
+        """
+        with self._lock:
+            self._refresh()
+            try:
+                with open(self._update_log(), "rb") as f:
+                    logged = f.read()
+            except FileNotFoundError:
+                return []
+        # A writer may be mid-append: whole rows only
+        return np.frombuffer(logged[:len(logged) - len(logged) % 8], dtype=np.int64).tolist()
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Zero-copy views of the used rows: (ids, vectors). Tombstones have id -1."""
+        with self._lock:
+            self._refresh()
+            if self._vectors is None:
+                return np.zeros(0, np.int64), np.zeros((0, self.dim), np.float32)
+            size = self._meta["size"]
+            return self._ids[:size], self._vectors[:size]
+
+    def search(self, query: np.ndarray, sponsor_ids: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score every live row (only those of `sponsor_ids`, if given) against `query`.
+
+        A (dim,) query gives (n_live,) scores; a (n_queries, dim) batch gives
+        (n_live, n_queries) from one matrix product. Returns (ids, scores).
+        """
+        ids, vectors = self.snapshot()
+        if sponsor_ids is not None:
+            rows = np.flatnonzero(np.isin(ids, sponsor_ids))
+            ids, vectors = ids[rows], vectors[rows]
+        scores = vectors @ query.astype(np.float32, copy=False).T
+        live = ids != TOMBSTONE
+        return ids[live], scores[live]
+
+    # ---------- Writes ----------
+
+    def _rows(self) -> Dict[int, int]:
+        if self._row_of is None:
+            ids = np.asarray(self._ids[:self._meta["size"]])
+            live = np.flatnonzero(ids != TOMBSTONE)
+            self._row_of = dict(zip(ids[live].tolist(), live.tolist()))
+        return self._row_of
+
+    def _grow(self, end: int):
+        """Make room for rows up to `end`, copying into a larger generation if needed."""
+        if end > len(self._ids):
+            size = self._meta["size"]
+            self._write_arrays(self._vectors[:size], self._ids[:size], max(MIN_CAPACITY, 2 * end))
+            self._write_meta()
+
+    def upsert(self, sponsor_id: int, vector: np.ndarray):
+        """Overwrite the sponsor's row in place, or append a new one."""
+        with self._write_lock():
+            rows = self._rows()
+            row = rows.get(sponsor_id)
+            if row is not None:
+                self._vectors[row] = vector
+                self._vectors.flush()
+                if self._log_updates([row]):
+                    self._write_meta()
+                return
+
+            size = self._meta["size"]
+            self._grow(size + 1)
+            self._vectors[size] = vector
+            self._ids[size] = sponsor_id
+            self._vectors.flush()
+            self._ids.flush()
+            rows[sponsor_id] = size
+            self._meta["size"] = size + 1
+            self._meta["live"] += 1
+            self._write_meta()
+
+    def upsert_many(self, sponsor_ids: Iterable[int], vectors: np.ndarray):
+        """``upsert`` for a batch of sponsors under one lock, growing the files at most once."""
+        sponsor_ids = np.fromiter(sponsor_ids, dtype=np.int64)
+        # A repeated id keeps its last vector, as one upsert after another would
+        _, last = np.unique(sponsor_ids[::-1], return_index=True)
+        keep = np.sort(len(sponsor_ids) - 1 - last)
+        sponsor_ids, vectors = sponsor_ids[keep], vectors[keep]
+        with self._write_lock():
+            rows = self._rows()
+            existing_rows = np.fromiter((rows.get(sponsor_id, -1) for sponsor_id in sponsor_ids.tolist()), dtype=np.int64)
+            existing = existing_rows >= 0
+            self._vectors[existing_rows[existing]] = vectors[existing]
+
+            new_ids, new_vectors = sponsor_ids[~existing], vectors[~existing]
+            size = self._meta["size"]
+            end = size + len(new_ids)
+            self._grow(end)
+            self._vectors[size:end] = new_vectors
+            self._ids[size:end] = new_ids
+            self._vectors.flush()
+            self._ids.flush()
+            rows.update(zip(new_ids.tolist(), range(size, end)))
+            self._meta["size"] = end
+            self._meta["live"] += len(new_ids)
+            if self._log_updates(existing_rows[existing].tolist()) or len(new_ids):
+                self._write_meta()
+
+    def delete(self, sponsor_id: int):
+        """Tombstone the sponsor's row and compact once a quarter of rows are dead."""
+        with self._write_lock():
+            row = self._rows().pop(sponsor_id, None)
+            if row is None:
+                return
+            self._ids[row] = TOMBSTONE
+            self._vectors[row] = 0.0
+            self._ids.flush()
+            self._vectors.flush()
+            self._meta["live"] -= 1
+            if self._meta["size"] - self._meta["live"] > self._meta["size"] // 4:
+                self._compact()
+            self._write_meta()
+
+    def _log_updates(self, rows: List[int]) -> bool:
+        """
+        Append in-place overwrites to the epoch's update log.
+
+        A full log is cleared by compacting into a new epoch; returns whether
+        that happened, in which case ``meta.json`` needs writing.
+        """
+        if not rows:
+            return False
+        with open(self._update_log(), "ab") as f:
+            f.write(np.asarray(rows, dtype=np.int64).tobytes())
+            logged = f.tell() // 8
+        if logged > MAX_UPDATE_LOG:
+            self._compact()
+            return True
+        return False
+
+    def _start_epoch(self):
+        """Rows were renumbered: the next epoch starts with an empty update log."""
+        self._retired.append(os.path.basename(self._update_log()))
+        self._meta["epoch"] = self._meta.get("epoch", 0) + 1
+        self._row_of = None
+
+    def _compact(self):
+        size = self._meta["size"]
+        keep = np.flatnonzero(self._ids[:size] != TOMBSTONE)
+        self._write_arrays(
+            self._vectors[keep], self._ids[keep], max(MIN_CAPACITY, 2 * len(keep))
+        )
+        self._meta["size"] = self._meta["live"] = len(keep)
+        self._start_epoch()
+
+    def rebuild(self, ids: Iterable[int], vectors: np.ndarray):
+        """Replace the whole index, e.g. from the sponsors table on first use."""
+        ids = np.fromiter(ids, dtype=np.int64)
+        with self._write_lock():
+            self._write_arrays(vectors, ids, max(MIN_CAPACITY, 2 * len(ids)))
+            self._meta["size"] = self._meta["live"] = len(ids)
+            self._start_epoch()
+            self._write_meta()
+
+
+_sponsor_index: Optional[SponsorVectorIndex] = None
+
+
+def get_sponsor_index() -> SponsorVectorIndex:
+    """Process-wide index handle, created on first use as wide as the embedding backend's vectors."""
+    from app.ai_engine.embedding_service import embedding_service
+
+    global _sponsor_index
+    if _sponsor_index is None:
+        _sponsor_index = SponsorVectorIndex(settings.sponsor_index_path, embedding_service.dim)
+    return _sponsor_index
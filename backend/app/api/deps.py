@@ -1,32 +1,123 @@
 from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
-from app.database.session import get_db
+from app.database.session import get_async_db
 from app.models.user import User
+from app.services.api_keys import authenticate_api_key
+from app.services.principal_cache import Principal, principal_cache, token_state_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+# Routes that also accept machine clients: either credential may be sent
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
+api_key_scheme = APIKeyHeader(name="X-API-Key", auto_error=False)
 
-# ✅ 1. Dependency to get current user from JWT token
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
+
+def decode_access_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload"
-            )
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    # Refresh tokens are only accepted by /auth/refresh
+    if payload.get("sub") is None or payload.get("type") == "refresh":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload"
+        )
+    return payload
+
+
+async def load_principal(db: AsyncSession, email: str) -> Principal:
+    # Resolved principals are cached, so most requests skip the users lookup
+    principal = principal_cache.get(email)
+    if principal is None:
+        user = (await db.execute(select(User).where(User.email == email))).scalars().first()
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        principal = Principal.from_user(user)
+        principal_cache.set(email, principal)
+    return principal
+
+async def load_token_state(db: AsyncSession, email: str) -> tuple[int, bool]:
+    # (token_version, is_active), cached; a miss reads two columns, not the row
+    state = token_state_cache.get(email)
+    if state is None:
+        row = (await db.execute(
+            select(User.token_version, User.is_active).where(User.email == email)
+        )).first()
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+        state = (row.token_version or 0, bool(row.is_active))
+        token_state_cache.set(email, state)
+    return state
+
+
+def check_token_version(payload: dict, token_version: int, is_active: bool):
+    # Password changes and deactivation bump the user's token version
+    if payload.get("ver", token_version) != token_version or not is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+
 
-    user = db.query(User).filter(User.email == email).first()
+async def principal_from_token(db: AsyncSession, token: str) -> Principal:
+    payload = decode_access_token(token)
+    principal = await load_principal(db, payload["sub"])
+    check_token_version(payload, principal.token_version, principal.is_active)
+    return principal
+
+# ✅ 1. Dependency to get current user from JWT token
+async def get_current_user(db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)) -> Principal:
+    return await principal_from_token(db, token)
+
+# ✅ 2. Dependency to get the caller from the token's claims (or an API key)
+async def get_token_principal(
+    db: AsyncSession = Depends(get_async_db),
+    token: str | None = Depends(optional_oauth2_scheme),
+    api_key: str | None = Depends(api_key_scheme)
+) -> Principal:
+    """
+    Caller of handlers that only need id, organization and role.
+
+    Id, organization, admin flag and role come from the token's claims;
+    only its `ver` is checked, against the user's cached token version and
+    active flag, so most requests touch no database and a miss reads two
+    columns. A password change or deactivation revokes the user's tokens at
+    once in the worker that made it, and in other workers once their cached
+    entry expires (principal_cache_ttl_seconds), not when the token does.
+    Other changes to the claimed fields apply from the next token.
+    Service clients send an X-API-Key instead.
+    """
+    if api_key is not None:
+        principal = await authenticate_api_key(db, api_key)
+        if principal is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
+        return principal
+    if token is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    payload = decode_access_token(token)
+    if "uid" not in payload:
+        # Issued before access tokens carried authorization claims
+        return await principal_from_token(db, token)
+    check_token_version(payload, *await load_token_state(db, payload["sub"]))
+    return Principal.from_claims(payload)
+
+# ✅ 3. Dependency to get the current user's ORM row, for handlers that modify it
+async def get_current_user_row(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    user = await db.get(User, current_user.id)
     if user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     return user
 
-# ✅ 2. Dependency to enforce admin-only access
-def require_admin(current_user: User = Depends(get_current_user)):
+# ✅ 4. Dependency to enforce admin-only access
+async def require_admin(current_user: Principal = Depends(get_token_principal)):
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -34,11 +125,10 @@ def require_admin(current_user: User = Depends(get_current_user)):
         )
     return current_user
 
-def require_marketing_lead(current_user: User = Depends(get_current_user)):
-    if not (current_user.is_admin or getattr(current_user, "role", None) == "marketing_lead"):
+async def require_marketing_lead(current_user: Principal = Depends(get_token_principal)):
+    if not (current_user.is_admin or current_user.role == "marketing_lead"):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions — marketing lead access required."
         )
     return current_user
-
@@ -0,0 +1,80 @@
+# app/api/v1/api_keys.py
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from app.database.session import get_async_db
+from app.models.api_key import ApiKey
+from app.schemas.api_key import ApiKeyCreate, ApiKeyResponse, ApiKeyCreated
+from app.api.deps import require_admin
+from app.core.security import generate_api_key, hash_api_key
+from app.services.api_keys import api_key_cache
+from app.services.principal_cache import Principal
+
+router = APIRouter()
+
+
+@router.post("/", response_model=ApiKeyCreated, status_code=status.HTTP_201_CREATED)
+async def create_api_key(
+    key_data: ApiKeyCreate,
+    current_user: Principal = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Issue an API key for a service client (admin only); the key is shown once"""
+    
+    key, prefix = generate_api_key()
+    api_key = ApiKey(
+        prefix=prefix,
+        key_hash=hash_api_key(key),
+        name=key_data.name,
+        role=key_data.role,
+        user_id=current_user.id,
+        organization_id=current_user.organization_id
+    )
+    db.add(api_key)
+    await db.commit()
+    await db.refresh(api_key)
+    
+    return ApiKeyCreated(**ApiKeyResponse.from_orm(api_key).dict(), key=key)
+
+
+@router.get("/", response_model=List[ApiKeyResponse])
+async def list_api_keys(
+    current_user: Principal = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """List the organization's API keys (admin only)"""
+    
+    api_keys = (await db.execute(
+        select(ApiKey).where(
+            ApiKey.organization_id == current_user.organization_id
+        ).order_by(ApiKey.id)
+    )).scalars().all()
+    
+    return [ApiKeyResponse.from_orm(api_key) for api_key in api_keys]
+
+
+@router.delete("/{key_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_api_key(
+    key_id: int,
+    current_user: Principal = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Revoke an API key (admin only)"""
+    
+    api_key = (await db.execute(
+        select(ApiKey).where(
+            ApiKey.id == key_id,
+            ApiKey.organization_id == current_user.organization_id
+        )
+    )).scalars().first()
+    
+    if not api_key:
+        raise HTTPException(status_code=404, detail="API key not found")
+    
+    api_key.is_active = False
+    await db.commit()
+    api_key_cache.pop(api_key.prefix)
+    
+    return None
@@ -1,8 +1,118 @@
 # app/api/v1/auth.py
-from fastapi import APIRouter
+import time
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from jose import jwt, JWTError
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.api.deps import load_principal
+from app.config import settings
+from app.core.password_hashing import PasswordHashingBusy, password_hasher
+from app.core.revocation import token_revocations
+from app.core.security import create_access_token, create_refresh_token, needs_rehash
+from app.database.session import AsyncSessionLocal, get_async_db
+from app.models.user import User
+from app.schemas.user import LoginRequest, RefreshRequest, Token
+
+router = APIRouter(tags=["Auth"])
+
+
+async def _rehash_password(user_id: int, password: str, old_hash: str):
+    try:
+        new_hash = await password_hasher.hash(password)
+    except PasswordHashingBusy:
+        return  # retried on the next login
+    async with AsyncSessionLocal() as db:
+        # Only replace the hash that was verified; a concurrent password change wins
+        await db.execute(
+            update(User)
+            .where(User.id == user_id, User.hashed_password == old_hash)
+            .values(hashed_password=new_hash)
+        )
+        await db.commit()
 
-router = APIRouter(prefix="/auth", tags=["Auth"])
 
 @router.get("/health")
 def auth_health():
     return {"status": "auth ok"}
+
+
+@router.post("/login", response_model=Token)
+async def login(
+    credentials: LoginRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Exchange email and password for an access token"""
+    user = (await db.execute(select(User).where(User.email == credentials.email))).scalars().first()
+    if user is None or not await password_hasher.verify(credentials.password, user.hashed_password):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    # Hashes from before a bcrypt cost change are upgraded after the response
+    if needs_rehash(user.hashed_password):
+        background_tasks.add_task(_rehash_password, user.id, credentials.password, user.hashed_password)
+
+    return Token(access_token=create_access_token({}, user=user), refresh_token=create_refresh_token(user))
+
+
+def _decode_refresh_token(token: str) -> dict:
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    except JWTError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    if payload.get("type") != "refresh":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    return payload
+
+
+def _family_expiry() -> float:
+    # A chain lives as long as the newest refresh token it could have issued
+    return time.time() + settings.refresh_token_expire_days * 86400
+
+
+def _rotate(jti: str, family: str, expires_at: float):
+    # Blocking: revocation checks may sync from, and writes go to, the shared store
+    if token_revocations.is_revoked(family):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token has been revoked")
+    # The claim is atomic in the shared store, so of two concurrent refreshes
+    # with the same token exactly one wins, whatever the local view says
+    if token_revocations.is_revoked(jti) or not token_revocations.claim(jti, expires_at):
+        # A rotated-out token came back: someone holds a copy, so end the chain
+        token_revocations.revoke([family], _family_expiry())
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token has been revoked")
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh(body: RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Exchange a refresh token for a new access token and a new refresh token.
+
+    Each refresh token works once: its id is claimed with one atomic write
+    to the shared revocation store (ZADD NX with Redis), and a token whose
+    claim fails revokes its whole family. Family revocation is checked
+    against the in-process revocation list first, and the user comes from
+    the principal cache, so the database is read only on a cache miss.
+    """
+    payload = _decode_refresh_token(body.refresh_token)
+
+    principal = await load_principal(db, payload["sub"])
+    if payload.get("ver", 0) != principal.token_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token has been revoked")
+
+    await run_in_threadpool(_rotate, f"jti:{payload['jti']}", f"fam:{payload['fam']}", payload["exp"])
+    return Token(
+        access_token=create_access_token({}, user=principal),
+        refresh_token=create_refresh_token(principal, family=payload["fam"])
+    )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(body: RefreshRequest):
+    """Revoke the refresh token and every token rotated from the same login"""
+    payload = _decode_refresh_token(body.refresh_token)
+    token_revocations.revoke([f"fam:{payload['fam']}"], _family_expiry())
+    return None
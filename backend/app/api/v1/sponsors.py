@@ -1,76 +1,58 @@
 # app/api/v1/sponsors.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.models.sponsor import Sponsor
-from app.schemas.sponsor import SponsorCreate, SponsorUpdate, SponsorResponse, SponsorMatchRequest, SponsorMatchResponse
-from app.api.deps import get_current_user, require_marketing_lead
-from app.database.session import get_db
-from app.services.sponsor_matcher import SponsorMatcher
-
-router = APIRouter(prefix="/sponsors", tags=["Sponsors"])
-
-
-@router.post("/", response_model=SponsorResponse)
-def create_sponsor(
-    sponsor: SponsorCreate,
-    db: Session = Depends(get_db),
-    current_user=Depends(require_marketing_lead)
-):
-    db_sponsor = Sponsor(**sponsor.dict())
-    db.add(db_sponsor)
-    db.commit()
-    db.refresh(db_sponsor)
-    return db_sponsor
-
 
-@router.get("/", response_model=list[SponsorResponse])
-def list_sponsors(
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user)
-):
-    return db.query(Sponsor).all()
-
-
-@router.post("/match", response_model=list[SponsorMatchResponse])
-def match_sponsors(
-    request: SponsorMatchRequest,
-    db: Session = Depends(get_db),
-    current_user=Depends(require_marketing_lead)
-):
-    matcher = SponsorMatcher(db)
-    results = matcher.match_sponsors(request)
-    return results
-
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
-from app.database.session import get_db
-from app.models.user import User
+from app.database.session import get_async_db, get_db
+from app.models.organization import Organization
 from app.models.sponsor import Sponsor, SponsorStatus, SponsorTier
 from app.schemas.sponsor import (
     SponsorCreate, SponsorUpdate, SponsorResponse,
-    SponsorMatchRequest, SponsorMatchResponse
+    SponsorMatchRequest, SponsorMatchResponse, SponsorBatchMatchResponse,
+    ScoreJobResponse, SponsorImportResponse, SponsorBulkPatch
+)
+from app.api.deps import get_token_principal, require_marketing_lead
+from app.config import settings
+from app.core.pagination import keyset_page, next_page
+from app.schemas.pagination import CursorPage
+from app.services.match_cache import match_cache
+from app.services.principal_cache import Principal
+from app.services.score_jobs import score_jobs
+from app.services.sponsor_bulk import column_values, organization_sponsor_ids, patch_sponsors, upsert_sponsors
+from app.services.sponsor_import import (
+    csv_records, import_sponsor_records, ndjson_records, parse_csv, parse_ndjson
 )
-from app.api.deps import get_current_user, require_marketing_lead
-from app.services.sponsor_matcher import SponsorMatcher
+from app.services.sponsor_matcher import SponsorMatcher, index_sponsor, index_sponsors, unindex_sponsor
+from app.services.sponsor_search import apply_search
 
 router = APIRouter()
 
+MAX_BATCH_EVENTS = 100
+MAX_BULK_SPONSORS = 1000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
 
 
 @router.post("/", response_model=SponsorResponse, status_code=status.HTTP_201_CREATED)
-def create_sponsor(
+async def create_sponsor(
     sponsor_data: SponsorCreate,
-    current_user: User = Depends(require_marketing_lead),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_marketing_lead),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new sponsor"""
     
     # Check if sponsor already exists
-    existing = db.query(Sponsor).filter(
-        Sponsor.organization_id == current_user.organization_id,
-        Sponsor.contact_email == sponsor_data.contact_email
-    ).first()
+    existing = (await db.execute(
+        select(Sponsor).where(
+            Sponsor.organization_id == current_user.organization_id,
+            Sponsor.contact_email == sponsor_data.contact_email
+        )
+    )).scalars().first()
     
     if existing:
         raise HTTPException(
@@ -80,65 +62,188 @@ def create_sponsor(
     
     # Create sponsor
     db_sponsor = Sponsor(
-        **sponsor_data.dict(),
-        organization_id=current_user.organization_id,
-        added_by_id=current_user.id
+        **column_values(sponsor_data.dict()),
+        organization_id=current_user.organization_id
     )
     
     db.add(db_sponsor)
-    db.commit()
-    db.refresh(db_sponsor)
+    await db.commit()
+    await db.refresh(db_sponsor)
+    # Embedding and the on-disk index write block, so they run on the threadpool
+    await run_in_threadpool(index_sponsor, db_sponsor)
+    match_cache.invalidate(current_user.organization_id)
     
     return SponsorResponse.from_orm(db_sponsor)
 
 
-@router.get("/", response_model=List[SponsorResponse])
-def list_sponsors(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(20, le=100),
+@router.post("/import", response_model=SponsorImportResponse)
+async def import_sponsors(
+    request: Request,
+    current_user: Principal = Depends(require_marketing_lead),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create sponsors in bulk from a CSV (header row first) or NDJSON upload.
+    The body is streamed and written in chunks; rows that fail validation or
+    duplicate an existing sponsor are skipped and reported by line number.
+    """
+    
+    content_type = request.headers.get("content-type", "")
+    if NDJSON_MEDIA_TYPE in content_type:
+        records, parse = ndjson_records(request.stream()), parse_ndjson
+    elif CSV_MEDIA_TYPE in content_type:
+        records, parse = csv_records(request.stream()), parse_csv
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Upload {CSV_MEDIA_TYPE} or {NDJSON_MEDIA_TYPE}"
+        )
+    
+    try:
+        return await import_sponsor_records(
+            db, records, parse, current_user.organization_id, settings.sponsor_import_chunk_size
+        )
+    finally:
+        # Chunks commit as they go, so even a failed import may have added sponsors
+        match_cache.invalidate(current_user.organization_id)
+
+
+def _check_bulk_size(items: list):
+    if len(items) > MAX_BULK_SPONSORS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_SPONSORS} sponsors per request"
+        )
+
+
+@router.patch("/bulk", response_model=List[SponsorResponse])
+async def bulk_update_sponsors(
+    patches: List[SponsorBulkPatch],
+    current_user: Principal = Depends(require_marketing_lead),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Partially update many sponsors in one transaction.
+    Each item is a sponsor id plus the SponsorUpdate fields to change; either
+    every sponsor is updated or, if any id is unknown, none is.
+    """
+    
+    _check_bulk_size(patches)
+    ids = [patch.id for patch in patches]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each sponsor may appear only once per request"
+        )
+    
+    missing = set(ids) - await organization_sponsor_ids(db, current_user.organization_id, ids)
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Sponsors not found: {sorted(missing)}"
+        )
+    
+    rows = await patch_sponsors(db, patches)
+    await db.commit()
+    await run_in_threadpool(index_sponsors, rows)
+    match_cache.invalidate(current_user.organization_id)
+    
+    by_id = {row.id: row for row in rows}
+    return [SponsorResponse.from_orm(by_id[sponsor_id]) for sponsor_id in ids]
+
+
+@router.put("/bulk", response_model=List[SponsorResponse])
+async def bulk_upsert_sponsors(
+    sponsors: List[SponsorCreate],
+    current_user: Principal = Depends(require_marketing_lead),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create or replace many sponsors in one transaction.
+    A sponsor whose contact_email the organization already has is replaced
+    (fields left out revert to their defaults); any other is created.
+    """
+    
+    _check_bulk_size(sponsors)
+    if current_user.organization_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bulk upsert requires an organization"
+        )
+    emails = [sponsor.contact_email for sponsor in sponsors]
+    if len(set(emails)) != len(emails):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each contact_email may appear only once per request"
+        )
+    
+    try:
+        rows = await upsert_sponsors(db, current_user.organization_id, sponsors)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A sponsor name is already used by another sponsor"
+        )
+    await run_in_threadpool(index_sponsors, rows)
+    match_cache.invalidate(current_user.organization_id)
+    
+    return [SponsorResponse.from_orm(row) for row in rows]
+
+
+@router.get("/", response_model=CursorPage[SponsorResponse])
+async def list_sponsors(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
     status: Optional[SponsorStatus] = None,
     tier: Optional[SponsorTier] = None,
     industry: Optional[str] = None,
     search: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_token_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List all sponsors for the organization"""
+    """List all sponsors for the organization, best relevance first, a page at a time"""
     
-    query = db.query(Sponsor).filter(
+    query = select(Sponsor).where(
         Sponsor.organization_id == current_user.organization_id
     )
     
     # Apply filters
     if status:
-        query = query.filter(Sponsor.status == status)
+        query = query.where(Sponsor.status == status)
     if tier:
-        query = query.filter(Sponsor.tier == tier)
+        query = query.where(Sponsor.tier == tier)
     if industry:
-        query = query.filter(Sponsor.industry == industry)
-    if search:
-        query = query.filter(Sponsor.name.ilike(f"%{search}%"))
+        query = query.where(Sponsor.industry == industry)
     
-    # Order by relevance score
-    query = query.order_by(Sponsor.relevance_score.desc())
+    # Order by relevance score (search rank when searching), id breaking ties,
+    # continuing after the cursor
+    rank = Sponsor.relevance_score
+    if search:
+        query, rank = apply_search(query, search, db.bind.dialect.name)
+    query = keyset_page(query.add_columns(rank), [rank, Sponsor.id], cursor, limit)
     
-    sponsors = query.offset(skip).limit(limit).all()
+    rows = (await db.execute(query)).all()
+    rows, next_cursor = next_page(rows, limit, lambda row: (row[1], row[0].id))
     
-    return [SponsorResponse.from_orm(s) for s in sponsors]
+    return CursorPage(items=[SponsorResponse.from_orm(row[0]) for row in rows], next_cursor=next_cursor)
 
 
 @router.get("/{sponsor_id}", response_model=SponsorResponse)
-def get_sponsor(
+async def get_sponsor(
     sponsor_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_token_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific sponsor"""
     
-    sponsor = db.query(Sponsor).filter(
-        Sponsor.id == sponsor_id,
-        Sponsor.organization_id == current_user.organization_id
-    ).first()
+    sponsor = (await db.execute(
+        select(Sponsor).where(
+            Sponsor.id == sponsor_id,
+            Sponsor.organization_id == current_user.organization_id
+        )
+    )).scalars().first()
     
     if not sponsor:
         raise HTTPException(status_code=404, detail="Sponsor not found")
@@ -147,51 +252,59 @@ def get_sponsor(
 
 
 @router.put("/{sponsor_id}", response_model=SponsorResponse)
-def update_sponsor(
+async def update_sponsor(
     sponsor_id: int,
     sponsor_data: SponsorUpdate,
-    current_user: User = Depends(require_marketing_lead),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_marketing_lead),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a sponsor"""
     
-    sponsor = db.query(Sponsor).filter(
-        Sponsor.id == sponsor_id,
-        Sponsor.organization_id == current_user.organization_id
-    ).first()
+    sponsor = (await db.execute(
+        select(Sponsor).where(
+            Sponsor.id == sponsor_id,
+            Sponsor.organization_id == current_user.organization_id
+        )
+    )).scalars().first()
     
     if not sponsor:
         raise HTTPException(status_code=404, detail="Sponsor not found")
     
     # Update fields
-    update_data = sponsor_data.dict(exclude_unset=True)
+    update_data = column_values(sponsor_data.dict(exclude_unset=True))
     for field, value in update_data.items():
         setattr(sponsor, field, value)
     
-    db.commit()
-    db.refresh(sponsor)
+    await db.commit()
+    await db.refresh(sponsor)
+    await run_in_threadpool(index_sponsor, sponsor)
+    match_cache.invalidate(current_user.organization_id)
     
     return SponsorResponse.from_orm(sponsor)
 
 
 @router.delete("/{sponsor_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_sponsor(
+async def delete_sponsor(
     sponsor_id: int,
-    current_user: User = Depends(require_marketing_lead),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_marketing_lead),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a sponsor"""
     
-    sponsor = db.query(Sponsor).filter(
-        Sponsor.id == sponsor_id,
-        Sponsor.organization_id == current_user.organization_id
-    ).first()
+    sponsor = (await db.execute(
+        select(Sponsor).where(
+            Sponsor.id == sponsor_id,
+            Sponsor.organization_id == current_user.organization_id
+        )
+    )).scalars().first()
     
     if not sponsor:
         raise HTTPException(status_code=404, detail="Sponsor not found")
     
-    db.delete(sponsor)
-    db.commit()
+    await db.delete(sponsor)
+    await db.commit()
+    await run_in_threadpool(unindex_sponsor, sponsor_id)
+    match_cache.invalidate(current_user.organization_id)
     
     return None
 
@@ -199,76 +312,101 @@ def delete_sponsor(
 @router.post("/match", response_model=List[SponsorMatchResponse])
 def match_sponsors_to_event(
     match_request: SponsorMatchRequest,
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    current_user: Principal = Depends(get_token_principal),
     db: Session = Depends(get_db)
 ):
     """
     AI-powered sponsor matching to event.
     Returns ranked list of sponsors based on relevance.
+    With `Accept: application/x-ndjson` the ranking is streamed one JSON
+    object per line, in ranked chunks, instead of as a single array.
     """
     
-    # Get active sponsors
-    sponsors = db.query(Sponsor).filter(
-        Sponsor.organization_id == current_user.organization_id,
-        Sponsor.status.in_([SponsorStatus.ACTIVE, SponsorStatus.PROSPECT])
-    ).all()
-    
-    if not sponsors:
-        return []
-    
-    # Perform AI matching
-    matches = sponsor_matcher.match_sponsors_to_event(
-        sponsors=sponsors,
-        event={
-            'title': match_request.event_title,
-            'description': match_request.event_description,
-            'category': match_request.event_category,
-            'tags': match_request.event_tags
-        },
-        top_k=match_request.top_k
-    )
+    matcher = SponsorMatcher(db, organization_id=getattr(current_user, "organization_id", None))
     
-    # Format response
-    results = []
-    for sponsor, score in matches:
-        results.append(SponsorMatchResponse(
-            sponsor=SponsorResponse.from_orm(sponsor),
-            relevance_score=float(score),
-            match_reasons=sponsor_matcher.get_match_reasons(sponsor, match_request)
-        ))
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        chunks = matcher.stream_matches(match_request)
+        return StreamingResponse(
+            ("".join(match.model_dump_json() + "\n" for match in chunk) for chunk in chunks),
+            media_type=NDJSON_MEDIA_TYPE
+        )
     
-    return results
+    return matcher.match_sponsors(match_request)
 
 
-@router.post("/update-scores", status_code=status.HTTP_200_OK)
+@router.post("/match/batch", response_model=List[SponsorBatchMatchResponse])
+def match_sponsors_to_events(
+    match_requests: List[SponsorMatchRequest],
+    current_user: Principal = Depends(get_token_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    Sponsor matching for several events in one call.
+    Sponsors are loaded and scored once for the whole batch; results come
+    back in request order, each with its own top_k.
+    """
+    
+    if len(match_requests) > MAX_BATCH_EVENTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_EVENTS} events per batch"
+        )
+    
+    matcher = SponsorMatcher(db, organization_id=getattr(current_user, "organization_id", None))
+    results = matcher.match_sponsors_batch(match_requests)
+    
+    return [
+        SponsorBatchMatchResponse(event_name=request.event_name, matches=matches)
+        for request, matches in zip(match_requests, results)
+    ]
+
+
+@router.get("/match/cache-stats")
+def match_cache_stats(current_user: Principal = Depends(require_marketing_lead)):
+    """Hit/miss counters and occupancy of the match result cache (per worker)."""
+    return match_cache.stats()
+
+
+@router.post("/update-scores", response_model=ScoreJobResponse, status_code=status.HTTP_202_ACCEPTED)
 def update_relevance_scores(
-    current_user: User = Depends(require_marketing_lead),
+    current_user: Principal = Depends(require_marketing_lead),
     db: Session = Depends(get_db)
 ):
     """
     Update relevance scores for all sponsors.
     Should be run periodically or after organization profile changes.
+    Runs as a background job; poll /update-scores/{job_id} for progress.
     """
     
-    sponsors = db.query(Sponsor).filter(
-        Sponsor.organization_id == current_user.organization_id
-    ).all()
-    
-    if not sponsors:
-        return {"message": "No sponsors to update"}
-    
     # Get organization profile
-    org = current_user.organization
+    org = db.get(Organization, current_user.organization_id) if current_user.organization_id is not None else None
+    if not org:
+        raise HTTPException(status_code=404, detail="Organization not found")
     org_profile = {
         'description': org.description or '',
         'focus_areas': [],  # Can be extended
         'past_event_themes': []  # Can be extended
     }
+    profile_text = " ".join(
+        [org_profile['description'], *org_profile['focus_areas'], *org_profile['past_event_themes']]
+    )
     
-    # Update scores
-    sponsor_matcher.batch_update_relevance_scores(sponsors, org_profile)
+    job = score_jobs.submit(current_user.organization_id, profile_text)
     
-    return {
-        "message": f"Updated relevance scores for {len(sponsors)} sponsors",
-        "sponsors_updated": len(sponsors)
-    }
+    return job.to_dict()
+
+
+@router.get("/update-scores/{job_id}", response_model=ScoreJobResponse)
+def get_relevance_score_job(
+    job_id: str,
+    current_user: Principal = Depends(require_marketing_lead)
+):
+    """Progress and throughput (rows/sec) of a relevance score job"""
+    
+    job = score_jobs.get(job_id)
+    
+    if not job or job.organization_id != current_user.organization_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return job.to_dict()
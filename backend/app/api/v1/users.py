@@ -1,130 +1,144 @@
 # app/api/v1/users.py
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List
-from app.database.session import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.database.session import get_async_db
+from app.models.organization import Organization
 from app.models.user import User, ActivityLog
 from app.schemas.user import (
     UserResponse, UserUpdate, UserWithOrganization,
     PasswordChange, ActivityLogResponse
 )
-from app.api.deps import get_current_user, require_admin
-from app.core.security import verify_password, get_password_hash
+from app.api.deps import get_current_user, get_current_user_row, get_token_principal, require_admin
+from app.core.pagination import keyset_page, next_page
+from app.core.password_hashing import password_hasher
+from app.schemas.pagination import CursorPage
+from app.services.api_keys import forget_user_api_keys
+from app.services.principal_cache import Principal, forget_user
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=UserWithOrganization)
-def get_current_user_profile(current_user: User = Depends(get_current_user)):
+async def get_current_user_profile(current_user: Principal = Depends(get_current_user)):
     """Get current user profile with organization details"""
     return current_user
 
 
 @router.put("/me", response_model=UserResponse)
-def update_current_user_profile(
+async def update_current_user_profile(
     user_data: UserUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user: User = Depends(get_current_user_row),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user profile"""
     
     # Update fields
     update_data = user_data.dict(exclude_unset=True)
     for field, value in update_data.items():
-        setattr(current_user, field, value)
+        setattr(user, field, value)
+    if "is_active" in update_data:
+        user.token_version += 1
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(user)
+    forget_user(user.email)
+    if "is_active" in update_data:
+        await forget_user_api_keys(db, user.id)
     
-    return UserResponse.from_orm(current_user)
+    return UserResponse.from_orm(user)
 
 
 @router.post("/me/change-password", status_code=status.HTTP_200_OK)
-def change_password(
+async def change_password(
     password_data: PasswordChange,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user: User = Depends(get_current_user_row),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Change user password"""
     
-    # Verify old password
-    if not verify_password(password_data.old_password, current_user.hashed_password):
+    # bcrypt runs on the dedicated hashing executor, not the event loop
+    if not await password_hasher.verify(password_data.old_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect password"
         )
     
-    # Update password
-    current_user.hashed_password = get_password_hash(password_data.new_password)
-    db.commit()
-    
-    # Log activity
-    activity = ActivityLog(
-        user_id=current_user.id,
-        action="UPDATE_PASSWORD",
-        description="Password changed successfully"
-    )
-    db.add(activity)
-    db.commit()
+    # Update password and log activity in one transaction
+    user.hashed_password = await password_hasher.hash(password_data.new_password)
+    user.token_version += 1
+    db.add(ActivityLog(user_id=user.id, organization_id=user.organization_id, action="UPDATE_PASSWORD"))
+    await db.commit()
+    forget_user(user.email)
     
     return {"message": "Password changed successfully"}
 
 
-@router.get("/", response_model=List[UserResponse])
-def list_organization_users(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(20, le=100),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+@router.get("/", response_model=CursorPage[UserResponse])
+async def list_organization_users(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List all users in the organization (admin only sees all, others see themselves)"""
     
     if current_user.is_admin:
         # Admins can see all users in their organization
-        users = db.query(User).filter(
+        query = select(User).where(
             User.organization_id == current_user.organization_id
-        ).offset(skip).limit(limit).all()
+        )
+        users = (await db.execute(
+            keyset_page(query, [User.id], cursor, limit, descending=False)
+        )).scalars().all()
+        users, next_cursor = next_page(users, limit, lambda user: (user.id,))
     else:
         # Regular users only see themselves
-        users = [current_user]
+        users, next_cursor = [current_user], None
     
-    return [UserResponse.from_orm(user) for user in users]
+    return CursorPage(items=[UserResponse.from_orm(user) for user in users], next_cursor=next_cursor)
 
 
 @router.get("/{user_id}", response_model=UserWithOrganization)
-def get_user(
+async def get_user(
     user_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_token_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific user"""
     
-    user = db.query(User).filter(User.id == user_id).first()
+    row = (await db.execute(
+        select(User, Organization.name).outerjoin(User.organization).where(User.id == user_id)
+    )).first()
     
-    if not user:
+    if not row:
         raise HTTPException(status_code=404, detail="User not found")
+    user = row.User
     
     # Check permissions: can only view users in same organization
     if user.organization_id != current_user.organization_id and not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    return user
+    return UserWithOrganization(**UserResponse.from_orm(user).dict(), organization_name=row.name)
 
 
 @router.put("/{user_id}", response_model=UserResponse)
-def update_user(
+async def update_user(
     user_id: int,
     user_data: UserUpdate,
-    current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a user (admin only)"""
     
-    user = db.query(User).filter(
-        User.id == user_id,
-        User.organization_id == current_user.organization_id
-    ).first()
+    user = (await db.execute(
+        select(User).where(
+            User.id == user_id,
+            User.organization_id == current_user.organization_id
+        )
+    )).scalars().first()
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -133,25 +147,32 @@ def update_user(
     update_data = user_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(user, field, value)
+    if "is_active" in update_data:
+        user.token_version += 1
     
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    forget_user(user.email)
+    if "is_active" in update_data:
+        await forget_user_api_keys(db, user.id)
     
     return UserResponse.from_orm(user)
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(
+async def delete_user(
     user_id: int,
-    current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Deactivate a user (admin only)"""
     
-    user = db.query(User).filter(
-        User.id == user_id,
-        User.organization_id == current_user.organization_id
-    ).first()
+    user = (await db.execute(
+        select(User).where(
+            User.id == user_id,
+            User.organization_id == current_user.organization_id
+        )
+    )).scalars().first()
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -164,38 +185,55 @@ def delete_user(
     
     # Soft delete - deactivate instead of deleting
     user.is_active = False
-    db.commit()
+    user.token_version += 1
+    await db.commit()
+    forget_user(user.email)
+    await forget_user_api_keys(db, user.id)
     
     return None
 
 
-@router.get("/me/activity", response_model=List[ActivityLogResponse])
-def get_user_activity(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(20, le=100),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+@router.get("/me/activity", response_model=CursorPage[ActivityLogResponse])
+async def get_user_activity(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Principal = Depends(get_token_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user's activity log"""
     
-    activities = db.query(ActivityLog).filter(
+    query = select(ActivityLog).where(
         ActivityLog.user_id == current_user.id
-    ).order_by(ActivityLog.timestamp.desc()).offset(skip).limit(limit).all()
-    
-    return [ActivityLogResponse.from_orm(activity) for activity in activities]
+    )
+    activities = (await db.execute(
+        keyset_page(query, [ActivityLog.timestamp, ActivityLog.id], cursor, limit)
+    )).scalars().all()
+    activities, next_cursor = next_page(activities, limit, lambda a: (a.timestamp, a.id))
+    
+    return CursorPage(
+        items=[ActivityLogResponse.from_orm(activity) for activity in activities],
+        next_cursor=next_cursor
+    )
 
 
-@router.get("/organization/activity", response_model=List[ActivityLogResponse])
-def get_organization_activity(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(20, le=100),
-    current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+@router.get("/organization/activity", response_model=CursorPage[ActivityLogResponse])
+async def get_organization_activity(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Principal = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get organization-wide activity log (admin only)"""
     
-    activities = db.query(ActivityLog).join(User).filter(
-        User.organization_id == current_user.organization_id
-    ).order_by(ActivityLog.timestamp.desc()).offset(skip).limit(limit).all()
-    
-    return [ActivityLogResponse.from_orm(activity) for activity in activities]
\ No newline at end of file
+    query = select(ActivityLog).where(
+        ActivityLog.organization_id == current_user.organization_id
+    )
+    activities = (await db.execute(
+        keyset_page(query, [ActivityLog.timestamp, ActivityLog.id], cursor, limit)
+    )).scalars().all()
+    activities, next_cursor = next_page(activities, limit, lambda a: (a.timestamp, a.id))
+    
+    return CursorPage(
+        items=[ActivityLogResponse.from_orm(activity) for activity in activities],
+        next_cursor=next_cursor
+    )
\ No newline at end of file
@@ -0,0 +1,54 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Callable, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, tuple_
+
+
+def encode_cursor(*values) -> str:
+    """Opaque token for the sort key of the last row on a page."""
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> tuple:
+    """Sort key from `cursor`, converted to the Python types of `columns`."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        return tuple(
+            datetime.fromisoformat(value) if column.type.python_type is datetime else column.type.python_type(value)
+            for column, value in zip(columns, values)
+        )
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def keyset_page(query, columns: Sequence, cursor: Optional[str], limit: int, descending: bool = True):
+    """
+    Restrict `query` to the page after `cursor`, ordered by `columns`.
+
+    The last column must be unique (the primary key) so the order is total.
+    Rows are found with a row-value comparison on the sort key instead of
+    an OFFSET, so a deep page costs the same as the first one given an
+    index on the same columns. One extra row is fetched to tell whether
+    another page exists (see ``next_page``).
+    """
+    if cursor is not None:
+        values = decode_cursor(cursor, columns)
+        key = tuple_(*columns)
+        after = tuple_(*(bindparam(None, value, type_=column.type) for column, value in zip(columns, values)))
+        query = query.where(key < after if descending else key > after)
+    order = [column.desc() if descending else column.asc() for column in columns]
+    return query.order_by(*order).limit(limit + 1)
+
+
+def next_page(rows: Sequence, limit: int, sort_key: Callable[[object], tuple]) -> Tuple[List, Optional[str]]:
+    """(page rows, next_cursor) from the `limit + 1` rows ``keyset_page`` fetched."""
+    if len(rows) <= limit:
+        return list(rows), None
+    rows = list(rows[:limit])
+    return rows, encode_cursor(*sort_key(rows[-1]))
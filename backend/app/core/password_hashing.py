@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+from app.config import settings
+from app.core.metrics import Histogram
+from app.core.security import bcrypt_rounds, get_password_hash, verify_password
+
+HASH_MS_BUCKETS = (10, 25, 50, 100, 200, 400, 800, 1600, 3200)
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the hashing backlog is full; the API answers 429."""
+
+
+class PasswordHasher:
+    """
+    Dedicated, size-limited executor for bcrypt work.
+
+    KDF calls run on their own small thread pool (bcrypt releases the GIL)
+    instead of Starlette's shared threadpool, and handlers ``await`` them, so
+    a burst of logins or password changes cannot tie up the threads that
+    serve everything else. Once ``max_pending`` calls are queued or running,
+    new ones are rejected immediately rather than waiting behind the backlog.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rejected = 0
+
+        self.queue_wait_ms = Histogram(HASH_MS_BUCKETS)
+        self.duration_ms = Histogram(HASH_MS_BUCKETS)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self._submit(verify_password, plain_password, hashed_password))
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(get_password_hash, password))
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "bcrypt_rounds": bcrypt_rounds(),
+            "max_pending": self.max_pending,
+            "queue_depth": max(0, self._pending - self.workers),
+            "in_flight": self._pending,
+            "rejected": self.rejected,
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+            "duration_ms": self.duration_ms.snapshot(),
+        }
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHashingBusy()
+            self._pending += 1
+        enqueued_at = time.perf_counter()
+
+        def run():
+            started_at = time.perf_counter()
+            self.queue_wait_ms.observe((started_at - enqueued_at) * 1000)
+            try:
+                return fn(*args)
+            finally:
+                self.duration_ms.observe((time.perf_counter() - started_at) * 1000)
+                with self._lock:
+                    self._pending -= 1
+
+        return self._executor.submit(run)
+
+
+password_hasher = PasswordHasher(settings.password_hash_workers, settings.password_hash_max_pending)
@@ -0,0 +1,164 @@
+import hashlib
+import math
+import threading
+import time
+from typing import Dict, Iterable
+from app.config import settings
+
+REVOKED_KEY = "auth:revoked"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing from one blake2b digest)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class MemoryRevocationStore:
+    """Process-local stand-in for the shared store (single worker, tests)."""
+
+    def __init__(self):
+        self._entries: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, item: str, expires_at: float):
+        with self._lock:
+            self._entries[item] = expires_at
+
+    def claim(self, item: str, expires_at: float) -> bool:
+        with self._lock:
+            if self._entries.get(item, 0) > time.time():
+                return False
+            self._entries[item] = expires_at
+            return True
+
+    def load(self, now: float) -> Dict[str, float]:
+        with self._lock:
+            self._entries = {item: exp for item, exp in self._entries.items() if exp > now}
+            return dict(self._entries)
+
+
+class RedisRevocationStore:
+    """
+    Revocations shared by every worker: one Redis sorted set scored by expiry.
+
+    ``redis`` is an optional dependency and is only imported on first use.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self._redis = None
+
+    @property
+    def client(self):
+        if self._redis is None:
+            import redis
+
+            self._redis = redis.Redis.from_url(self.url, decode_responses=True)
+        return self._redis
+
+    def add(self, item: str, expires_at: float):
+        self.client.zadd(REVOKED_KEY, {item: expires_at})
+
+    def claim(self, item: str, expires_at: float) -> bool:
+        # NX: only the first writer adds the member, atomically across workers
+        return self.client.zadd(REVOKED_KEY, {item: expires_at}, nx=True) == 1
+
+    def load(self, now: float) -> Dict[str, float]:
+        pipeline = self.client.pipeline()
+        pipeline.zremrangebyscore(REVOKED_KEY, "-inf", now)
+        pipeline.zrangebyscore(REVOKED_KEY, now, "+inf", withscores=True)
+        return dict(pipeline.execute()[1])
+
+
+class RevocationList:
+    """
+    In-process view of revoked token ids, refreshed from a shared store.
+
+    Lookups go through a Bloom filter first, so the common case (a token that
+    was never revoked) is answered from memory with no set probe and no
+    network call; filter hits are confirmed against the exact set. Every
+    `sync_seconds` the whole live set is reloaded from the store and the
+    filter rebuilt, which also drops expired entries. Local revocations are
+    written through and visible in this process immediately.
+    """
+
+    def __init__(self, store, sync_seconds: float = 5.0, timer=time.time):
+        self.store = store
+        self.sync_seconds = sync_seconds
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._exact: Dict[str, float] = {}
+        self._bloom = BloomFilter(1024)
+        self._synced_at = -math.inf
+
+    def _rebuild(self, entries: Dict[str, float]):
+        bloom = BloomFilter(max(1024, 2 * len(entries)))
+        for item in entries:
+            bloom.add(item)
+        self._exact, self._bloom = entries, bloom
+
+    def sync(self):
+        now = self._timer()
+        entries = self.store.load(now)
+        with self._lock:
+            # Keep local revocations the load may have raced with
+            entries.update((item, exp) for item, exp in self._exact.items() if exp > now)
+            self._rebuild(entries)
+            self._synced_at = now
+
+    def revoke(self, items: Iterable[str], expires_at: float):
+        for item in items:
+            self.store.add(item, expires_at)
+            with self._lock:
+                self._exact[item] = expires_at
+                self._bloom.add(item)
+
+    def claim(self, item: str, expires_at: float) -> bool:
+        """
+        Revoke `item` unless it already is, as one atomic step in the store.
+
+        Returns False if another caller (in any worker) got there first, even
+        when this process has not synced that revocation yet.
+        """
+        claimed = self.store.claim(item, expires_at)
+        with self._lock:
+            self._exact[item] = max(expires_at, self._exact.get(item, 0))
+            self._bloom.add(item)
+        return claimed
+
+    def is_revoked(self, *items: str) -> bool:
+        if self._timer() - self._synced_at >= self.sync_seconds:
+            self.sync()
+        for item in items:
+            if item in self._bloom and self._exact.get(item, 0) > self._timer():
+                return True
+        return False
+
+
+def create_revocation_list(backend: str, url: str, sync_seconds: float) -> RevocationList:
+    if backend == "memory":
+        return RevocationList(MemoryRevocationStore(), sync_seconds)
+    return RevocationList(RedisRevocationStore(url), sync_seconds)
+
+
+token_revocations = create_revocation_list(
+    settings.token_revocation_store, settings.redis_url, settings.token_revocation_sync_seconds
+)
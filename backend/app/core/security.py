@@ -1,3 +1,9 @@
+import hashlib
+import hmac
+import math
+import secrets
+import time
+import uuid
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
@@ -5,15 +11,123 @@ from app.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Calibration never goes below the OWASP floor, whatever the hardware
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
+
+
+def time_bcrypt(rounds: int, samples: int = 3) -> float:
+    """Best-of-`samples` seconds for one bcrypt verify at `rounds` on this machine."""
+    context = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=rounds)
+    hashed = context.hash("calibration")
+    best = math.inf
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.verify("calibration", hashed)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def calibrate_bcrypt_rounds(target_ms: float) -> int:
+    """
+    The bcrypt cost whose verify time is closest to `target_ms` here.
+
+    Each extra round doubles the work, so one measurement at the floor is
+    enough to extrapolate the rest.
+    """
+    floor_ms = time_bcrypt(BCRYPT_MIN_ROUNDS) * 1000
+    rounds = BCRYPT_MIN_ROUNDS + round(math.log2(target_ms / floor_ms))
+    return max(BCRYPT_MIN_ROUNDS, min(BCRYPT_MAX_ROUNDS, rounds))
+
+
+def set_bcrypt_rounds(rounds: int):
+    """
+    New hashes use `rounds`; only hashes below it report needs_update.
+
+    No ceiling: workers that calibrate to different costs then converge on
+    the highest instead of rehashing each other's hashes back and forth.
+    """
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+
+
+def bcrypt_rounds() -> int:
+    return pwd_context.handler("bcrypt").default_rounds
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    return pwd_context.needs_update(hashed_password)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+def access_token_claims(user) -> dict:
+    """Identity and authorization claims; `ver` ties the token to the user's token_version."""
+    return {
+        "sub": user.email,
+        "uid": user.id,
+        "org": getattr(user, "organization_id", None),
+        "is_admin": bool(user.is_admin),
+        "role": getattr(user, "role", None),
+        "ver": user.token_version or 0,
+    }
+
 # Optional if you plan to use JWT auth
-def create_access_token(data: dict, expires_delta: timedelta | None = None):
-    to_encode = data.copy()
+def create_access_token(data: dict, expires_delta: timedelta | None = None, user=None):
+    to_encode = access_token_claims(user) if user is not None else {}
+    to_encode.update(data)
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.access_token_expire_minutes))
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+
+
+def create_refresh_token(user, family: str | None = None) -> str:
+    """
+    Single-use refresh token. Rotation keeps the `fam` id of the login that
+    started the chain, so replaying a used token can revoke the whole chain.
+    """
+    expire = datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days)
+    return jwt.encode(
+        {
+            "type": "refresh",
+            "sub": user.email,
+            "uid": user.id,
+            "ver": user.token_version or 0,
+            "jti": uuid.uuid4().hex,
+            "fam": family or uuid.uuid4().hex,
+            "exp": expire,
+        },
+        settings.secret_key,
+        algorithm=settings.algorithm,
+    )
+
+
+# ---------- API keys ----------
+
+API_KEY_PREFIX = "imk"
+
+
+def generate_api_key() -> tuple[str, str]:
+    """A new (key, lookup prefix) pair; the full key is shown to the client once."""
+    prefix = secrets.token_hex(6)
+    return f"{API_KEY_PREFIX}_{prefix}_{secrets.token_urlsafe(32)}", prefix
+
+
+def api_key_prefix(key: str) -> str | None:
+    parts = key.split("_", 2)
+    if len(parts) != 3 or parts[0] != API_KEY_PREFIX:
+        return None
+    return parts[1]
+
+
+def hash_api_key(key: str) -> str:
+    """
+    HMAC-SHA256 of the key: microseconds to check, unlike a password KDF.
+
+    Keys are 256-bit random secrets, so a slow hash buys nothing against
+    guessing; the server-side secret keeps a leaked table unusable.
+    """
+    secret = (settings.api_key_secret or settings.secret_key).encode("utf-8")
+    return hmac.new(secret, key.encode("utf-8"), hashlib.sha256).hexdigest()
@@ -2,5 +2,7 @@ from sqlalchemy.orm import declarative_base
 from app.models.user import User, ActivityLog
 from app.database.base_class import Base  # Import Base only
 from app.models.user import User, ActivityLog  # Import all models here
+from app.models.api_key import ApiKey
+from app.models.organization import Organization
 
 Base = declarative_base()
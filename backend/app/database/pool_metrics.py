@@ -0,0 +1,113 @@
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.config import settings
+from app.core.metrics import Histogram
+
+POOL_MS_BUCKETS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000, 30000)
+
+
+class PoolMetrics:
+    """
+    Live connection-pool statistics for one engine.
+
+    Checkouts, checkins, new connections and invalidations come from the
+    pool events; the time each connection is held is measured between the
+    checkout and checkin events. SQLAlchemy has no event for "checkout
+    requested", so waiting for a connection (and timing out) is measured by
+    the pool classes from ``instrumented_pool``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_ms = Histogram(POOL_MS_BUCKETS)
+        self.held_ms = Histogram(POOL_MS_BUCKETS)
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def attach(self, engine):
+        """Listen to `engine`'s pool events (a sync Engine, or AsyncEngine.sync_engine)."""
+
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            self._count("connects")
+
+        @event.listens_for(engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            self._count("checkouts")
+            connection_record.info["checked_out_at"] = time.perf_counter()
+
+        @event.listens_for(engine, "checkin")
+        def on_checkin(dbapi_connection, connection_record):
+            checked_out_at = connection_record.info.pop("checked_out_at", None)
+            if checked_out_at is not None:
+                self.held_ms.observe((time.perf_counter() - checked_out_at) * 1000)
+
+        @event.listens_for(engine, "invalidate")
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            self._count("invalidations")
+
+    def snapshot(self, pool) -> dict:
+        stats = {
+            "pool": type(pool).__name__,
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait_ms": self.wait_ms.snapshot(),
+            "held_ms": self.held_ms.snapshot(),
+        }
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                # what pool_options configured; QueuePool has no public getter
+                "max_overflow": settings.db_max_overflow,
+                "timeout_seconds": pool.timeout(),
+            })
+        return stats
+
+
+def instrumented_pool(pool_class, metrics: PoolMetrics):
+    """`pool_class` subclass that records checkout waits and timeouts into `metrics`."""
+
+    class InstrumentedPool(pool_class):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            except exc.TimeoutError:
+                metrics._count("timeouts")
+                raise
+            finally:
+                metrics.wait_ms.observe((time.perf_counter() - start) * 1000)
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+def pool_options(url: str, metrics: PoolMetrics, is_async: bool = False) -> dict:
+    """create_engine / create_async_engine keyword arguments from Settings."""
+    parsed = make_url(url)
+    options = {"pool_pre_ping": settings.db_pool_pre_ping}
+    # In-memory SQLite keeps one connection per thread; there is no queue to size
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        poolclass=instrumented_pool(AsyncAdaptedQueuePool if is_async else QueuePool, metrics),
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    return options
@@ -1,11 +1,25 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 from app.database.base import Base
+from app.database.pool_metrics import PoolMetrics, pool_options
 
-engine = create_engine(settings.database_url)
+sync_pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+engine = create_engine(settings.database_url, **pool_options(settings.database_url, sync_pool_metrics))
+sync_pool_metrics.attach(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Request handlers use the async engine; CPU-bound work that runs on worker
+# threads or processes (sponsor matching, score jobs) keeps the sync one.
+async_engine = create_async_engine(
+    settings.async_database_url, **pool_options(settings.async_database_url, async_pool_metrics, is_async=True)
+)
+async_pool_metrics.attach(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 def init_db():
     Base.metadata.create_all(bind=engine)
 
@@ -15,3 +29,7 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
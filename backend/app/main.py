@@ -1,11 +1,15 @@
 # app/main.py
 
-from fastapi import FastAPI
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from app.config import settings
-from app.database.session import init_db
-from app.api.v1 import auth, users, sponsors
+from app.database.session import async_engine, async_pool_metrics, engine, init_db, sync_pool_metrics
+from app.ai_engine.embedding_service import embedding_service
+from app.core.password_hashing import PasswordHashingBusy, password_hasher
+from app.core.security import calibrate_bcrypt_rounds, set_bcrypt_rounds
+from app.services.principal_cache import principal_cache
+from app.api.v1 import auth, users, sponsors, api_keys
 
 # Create FastAPI app
 app = FastAPI(
@@ -36,6 +40,33 @@ def health_check():
     }
 
 
+@app.get("/health/embeddings")
+def embedding_health():
+    """Queue depth, batch size and latency histograms of the embedding runtime"""
+    return embedding_service.stats()
+
+
+@app.get("/health/db")
+def database_health():
+    """Connection pool occupancy, checkout waits/timeouts and hold times, per engine"""
+    return {
+        "sync": sync_pool_metrics.snapshot(engine.pool),
+        "async": async_pool_metrics.snapshot(async_engine.sync_engine.pool),
+    }
+
+
+@app.get("/health/principal-cache")
+def principal_cache_health():
+    """Size and hit rate of the authenticated-principal cache"""
+    return principal_cache.stats()
+
+
+@app.get("/health/password-hashing")
+def password_hashing_health():
+    """Backlog, rejections and timings of the password-hashing executor"""
+    return password_hasher.stats()
+
+
 # Include routers
 app.include_router(
     auth.router,
@@ -55,6 +86,12 @@ app.include_router(
     tags=["Sponsors"]
 )
 
+app.include_router(
+    api_keys.router,
+    prefix=f"{settings.api_v1_prefix}/api-keys",
+    tags=["API Keys"]
+)
+
 
 # Error handlers
 @app.exception_handler(404)
@@ -65,6 +102,15 @@ async def not_found_handler(request, exc):
     )
 
 
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(request, exc):
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Too many password operations in progress, retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
     return JSONResponse(
@@ -79,6 +125,9 @@ async def startup_event():
     """Initialize database on startup"""
     # Uncomment to create tables automatically (use Alembic in production)
     # init_db()
+    rounds = settings.bcrypt_rounds or calibrate_bcrypt_rounds(settings.bcrypt_target_ms)
+    set_bcrypt_rounds(rounds)
+    print(f"🔐 bcrypt cost set to {rounds} rounds")
     print(f"🚀 {settings.app_name} v{settings.app_version} started!")
     print(f"📚 API docs available at: http://localhost:8000/docs")
 
@@ -86,6 +135,7 @@ async def startup_event():
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
+    await async_engine.dispose()
     print(f"👋 {settings.app_name} shutting down...")
 
 
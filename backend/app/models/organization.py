@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from datetime import datetime
+from app.database.base_class import Base
+
+
+class Organization(Base):
+    __tablename__ = "organizations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    # Profile sponsor relevance scores are computed against
+    description = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum, Float, Text, DateTime, ForeignKey
+from sqlalchemy import DDL, Column, Integer, String, Enum, Float, Text, DateTime, ForeignKey, Index, event
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum as PyEnum
@@ -22,6 +22,7 @@ class Sponsor(Base):
     __tablename__ = "sponsors"
 
     id = Column(Integer, primary_key=True, index=True)
+    organization_id = Column(Integer, index=True, nullable=True)
     name = Column(String, nullable=False, unique=True)
     industry = Column(String, nullable=True)
     contact_email = Column(String, nullable=False)
@@ -32,5 +33,61 @@ class Sponsor(Base):
     status = Column(Enum(SponsorStatus), default=SponsorStatus.PENDING)
     budget = Column(Float, nullable=True)
     notes = Column(Text, nullable=True)
+    relevance_score = Column(Float, default=0.0, nullable=False)  # part of the keyset sort key
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Created by migration c81f4e2a9d37
+        Index("ix_sponsors_org_relevance", organization_id, relevance_score.desc(), id.desc()),
+        # One sponsor per contact email in an organization; migration a6d03b9e51c4
+        Index("uq_sponsors_org_contact_email", organization_id, contact_email, unique=True),
+    )
+
+
+# Full-text search objects (queried by app/services/sponsor_search.py). These
+# hooks cover create_all; migration e2b95c714f08 adds them to existing databases.
+SEARCH_DDL = {
+    # Generated tsvector, name weighted over industry over notes
+    "postgresql": [
+        """
+        ALTER TABLE sponsors ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(industry, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(notes, '')), 'C')
+        ) STORED
+        """,
+        "CREATE INDEX ix_sponsors_search_vector ON sponsors USING gin (search_vector)",
+    ],
+    # External-content FTS5 table, kept in step with sponsors by triggers
+    "sqlite": [
+        """
+        CREATE VIRTUAL TABLE sponsors_fts USING fts5(
+            name, industry, notes, content='sponsors', content_rowid='id', tokenize='porter unicode61'
+        )
+        """,
+        """
+        CREATE TRIGGER sponsors_fts_insert AFTER INSERT ON sponsors BEGIN
+            INSERT INTO sponsors_fts(rowid, name, industry, notes) VALUES (new.id, new.name, new.industry, new.notes);
+        END
+        """,
+        """
+        CREATE TRIGGER sponsors_fts_delete AFTER DELETE ON sponsors BEGIN
+            INSERT INTO sponsors_fts(sponsors_fts, rowid, name, industry, notes)
+            VALUES ('delete', old.id, old.name, old.industry, old.notes);
+        END
+        """,
+        """
+        CREATE TRIGGER sponsors_fts_update AFTER UPDATE OF name, industry, notes ON sponsors BEGIN
+            INSERT INTO sponsors_fts(sponsors_fts, rowid, name, industry, notes)
+            VALUES ('delete', old.id, old.name, old.industry, old.notes);
+            INSERT INTO sponsors_fts(rowid, name, industry, notes) VALUES (new.id, new.name, new.industry, new.notes);
+        END
+        """,
+    ],
+}
+
+for _dialect, _statements in SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(Sponsor.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+event.listen(Sponsor.__table__, "before_drop", DDL("DROP TABLE IF EXISTS sponsors_fts").execute_if(dialect="sqlite"))
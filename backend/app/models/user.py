@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database.base_class import Base
@@ -12,8 +12,12 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
     is_admin = Column(Boolean, default=False)
+    organization_id = Column(Integer, ForeignKey("organizations.id"), index=True, nullable=True)
+    # Bumped to invalidate every access token issued before the change
+    token_version = Column(Integer, default=0, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    organization = relationship("Organization")
     activities = relationship("ActivityLog", back_populates="user")
 
 
@@ -22,7 +26,17 @@ class ActivityLog(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
+    # The user's organization when the action happened; copied so the
+    # organization feed is one index range, without joining users
+    organization_id = Column(Integer, nullable=True)
     action = Column(String, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
 
     user = relationship("User", back_populates="activities")
+
+    __table_args__ = (
+        # Created by migration c81f4e2a9d37
+        Index("ix_activity_logs_user_timestamp", user_id, timestamp.desc(), id.desc()),
+        # Created by migration a9d5e2f41c73
+        Index("ix_activity_logs_org_timestamp", organization_id, timestamp.desc(), id.desc()),
+    )
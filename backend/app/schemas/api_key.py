@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+# -------- API Key Schemas --------
+
+class ApiKeyCreate(BaseModel):
+    name: str
+    role: Optional[str] = None
+
+
+class ApiKeyResponse(BaseModel):
+    id: int
+    name: str
+    prefix: str
+    role: Optional[str] = None
+    is_active: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ApiKeyCreated(ApiKeyResponse):
+    key: str  # returned once, at creation; only its HMAC is stored
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Literal
 from enum import Enum
 
 
@@ -42,6 +42,10 @@ class SponsorUpdate(BaseModel):
     notes: Optional[str] = None
 
 
+class SponsorBulkPatch(SponsorUpdate):
+    id: int
+
+
 class SponsorResponse(SponsorBase):
     id: int
     created_at: datetime
@@ -51,6 +55,20 @@ class SponsorResponse(SponsorBase):
         from_attributes = True
 
 
+# ---------- Import Schemas ----------
+
+class SponsorImportError(BaseModel):
+    row: int  # line number in the upload
+    error: str
+
+
+class SponsorImportResponse(BaseModel):
+    received: int
+    imported: int
+    failed: int
+    errors: List[SponsorImportError]  # capped; `failed` has the full count
+
+
 # ---------- Matching Schemas ----------
 
 class SponsorMatchRequest(BaseModel):
@@ -58,9 +76,37 @@ class SponsorMatchRequest(BaseModel):
     event_theme: Optional[str] = None
     description: Optional[str] = None
     keywords: Optional[List[str]] = None
+    top_k: Optional[int] = Field(10, ge=1)  # None ranks every sponsor
+    engine: Optional[Literal["tfidf", "index", "ann"]] = None  # defaults to settings.sponsor_match_engine
+    nprobe: Optional[int] = Field(None, ge=1)  # ann only, defaults to settings.ann_nprobe
+
+
+class MatchReason(BaseModel):
+    term: str
+    weight: float
 
 
 class SponsorMatchResponse(BaseModel):
     sponsor_id: int
     sponsor_name: str
     relevance_score: float
+    match_reasons: List[MatchReason] = []
+
+
+class SponsorBatchMatchResponse(BaseModel):
+    event_name: str
+    matches: List[SponsorMatchResponse]
+
+
+# ---------- Background Job Schemas ----------
+
+class ScoreJobResponse(BaseModel):
+    job_id: str
+    status: str
+    total: int
+    processed: int
+    progress: float
+    rows_per_sec: float
+    elapsed_seconds: Optional[float] = None
+    created_at: datetime
+    error: Optional[str] = None
@@ -33,6 +33,23 @@ class UserWithOrganization(UserResponse):
     organization_name: Optional[str] = None
 
 
+# -------- Auth Schemas --------
+
+class LoginRequest(BaseModel):
+    email: EmailStr
+    password: str
+
+
+class Token(BaseModel):
+    access_token: str
+    refresh_token: Optional[str] = None
+    token_type: str = "bearer"
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
 # -------- Activity Log Schemas --------
 
 class ActivityLogResponse(BaseModel):
@@ -0,0 +1,62 @@
+import hmac
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.cache import LRUTTLCache
+from app.core.security import api_key_prefix, hash_api_key
+from app.models.api_key import ApiKey
+from app.models.user import User
+from app.services.principal_cache import Principal
+
+# prefix -> (key_hash, Principal) for keys that verified recently. Revoking a
+# key pops it here; other workers stop accepting it within the TTL.
+api_key_cache = LRUTTLCache(settings.api_key_cache_size, settings.api_key_cache_ttl_seconds)
+
+
+async def authenticate_api_key(db: AsyncSession, key: str) -> Optional[Principal]:
+    """
+    Principal for a presented API key, or None if it is unknown, revoked or
+    its owner has been deactivated.
+
+    The key's prefix finds the row through a unique index and the secret is
+    checked as a constant-time HMAC comparison; verified keys are cached, so
+    repeat calls cost one HMAC and no query.
+    """
+    prefix = api_key_prefix(key)
+    if prefix is None:
+        return None
+    key_hash = hash_api_key(key)
+
+    cached = api_key_cache.get(prefix)
+    if cached is not None:
+        stored_hash, principal = cached
+        return principal if hmac.compare_digest(stored_hash, key_hash) else None
+
+    row = (await db.execute(
+        select(ApiKey, User.email).join(User, ApiKey.user_id == User.id).where(
+            ApiKey.prefix == prefix,
+            ApiKey.is_active.is_(True),
+            User.is_active.is_(True)
+        )
+    )).first()
+    if row is None or not hmac.compare_digest(row.ApiKey.key_hash, key_hash):
+        return None
+
+    api_key = row.ApiKey
+    principal = Principal(
+        id=api_key.user_id,
+        email=row.email,
+        is_active=True,
+        is_admin=False,
+        role=api_key.role,
+        organization_id=api_key.organization_id,
+    )
+    api_key_cache.set(prefix, (api_key.key_hash, principal))
+    return principal
+
+
+async def forget_user_api_keys(db: AsyncSession, user_id: int):
+    """Drop a user's keys from this worker's cache, e.g. once the user is deactivated."""
+    for prefix in (await db.execute(select(ApiKey.prefix).where(ApiKey.user_id == user_id))).scalars():
+        api_key_cache.pop(prefix)
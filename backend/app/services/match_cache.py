@@ -0,0 +1,59 @@
+import hashlib
+import json
+import threading
+from typing import List, Optional
+from app.config import settings
+from app.core.cache import LRUTTLCache
+from app.schemas.sponsor import SponsorMatchRequest, SponsorMatchResponse
+
+
+def _normalize_text(text: Optional[str]) -> str:
+    return " ".join((text or "").lower().split())
+
+
+class MatchResultCache:
+    """
+    Cache of ranked match results in front of SponsorMatcher.
+
+    Keys are a hash of the normalized request plus the organization and its
+    generation number. Sponsor writes bump the organization's generation, so
+    stale entries simply stop being reachable and age out of the LRU.
+    Generations are per process; other workers catch up within the TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = LRUTTLCache(maxsize, ttl)
+        self._lock = threading.Lock()
+        self._generations: dict[Optional[int], int] = {}
+
+    def key(self, request: SponsorMatchRequest, organization_id: Optional[int]) -> str:
+        keywords = sorted({_normalize_text(keyword) for keyword in request.keywords or []} - {""})
+        canonical = {
+            "org": organization_id,
+            "generation": self._generations.get(organization_id, 0),
+            "event_name": _normalize_text(request.event_name),
+            "event_theme": _normalize_text(request.event_theme),
+            "description": _normalize_text(request.description),
+            "keywords": keywords,
+            "top_k": request.top_k,
+            "engine": request.engine or settings.sponsor_match_engine,
+            "nprobe": request.nprobe,
+        }
+        return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[SponsorMatchResponse]]:
+        return self._cache.get(key)
+
+    def set(self, key: str, matches: List[SponsorMatchResponse]):
+        self._cache.set(key, matches)
+
+    def invalidate(self, organization_id: Optional[int]):
+        """Drop every cached result for the organization (call after sponsor writes)."""
+        with self._lock:
+            self._generations[organization_id] = self._generations.get(organization_id, 0) + 1
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+match_cache = MatchResultCache(settings.match_cache_size, settings.match_cache_ttl_seconds)
@@ -0,0 +1,69 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from app.config import settings
+from app.core.cache import LRUTTLCache
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Snapshot of the authenticated user, as resolved by get_current_user.
+
+    Immutable because one instance is shared by every request carrying the
+    same token subject; handlers that change the user load the row itself.
+    """
+
+    id: int
+    email: str
+    is_active: bool
+    is_admin: bool
+    role: Optional[str]
+    organization_id: Optional[int]
+    token_version: int = 0
+    # Profile fields; only set when resolved from the users table
+    full_name: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            is_active=user.is_active,
+            is_admin=user.is_admin,
+            role=getattr(user, "role", None),
+            organization_id=user.organization_id,
+            token_version=user.token_version or 0,
+            full_name=user.full_name,
+            created_at=user.created_at,
+        )
+
+    @classmethod
+    def from_claims(cls, claims: dict) -> "Principal":
+        """The caller as the access token describes it (see security.access_token_claims)."""
+        return cls(
+            id=claims["uid"],
+            email=claims["sub"],
+            is_active=True,
+            is_admin=bool(claims.get("is_admin")),
+            role=claims.get("role"),
+            organization_id=claims.get("org"),
+            token_version=claims.get("ver", 0),
+        )
+
+
+# Keyed by the token's `sub` (the user's email). Writes to a user pop its
+# entry in this process; other workers see the change within the TTL.
+principal_cache = LRUTTLCache(settings.principal_cache_size, settings.principal_cache_ttl_seconds)
+
+# sub -> (token_version, is_active): all the claims path checks per request.
+# Same bounds as principal_cache; popped together with it by forget_user.
+token_state_cache = LRUTTLCache(settings.principal_cache_size, settings.principal_cache_ttl_seconds)
+
+
+def forget_user(email: str):
+    """Drop a user's cached principal and token state in this process, after a write to the user."""
+    principal_cache.pop(email)
+    token_state_cache.pop(email)
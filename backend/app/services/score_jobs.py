@@ -0,0 +1,174 @@
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.ai_engine.embeddings import HashingEmbedder
+from app.ai_engine.tfidf import sponsor_document
+from app.config import settings
+from app.database.session import SessionLocal
+from app.models.sponsor import Sponsor
+
+MAX_JOB_HISTORY = 100
+
+
+def score_chunk(rows: List[Tuple[int, str, str, str]], profile_text: str, dim: int) -> List[Tuple[int, float]]:
+    """
+    Relevance of each sponsor to the organization profile (runs in a worker process).
+
+    Uses the hashing embedder, which needs no shared state, so chunks can be
+    scored in any process in any order.
+    """
+    embedder = HashingEmbedder(dim)
+    profile = embedder.embed_one(profile_text)
+    vectors = embedder.embed(sponsor_document(name, industry, notes) for _, name, industry, notes in rows)
+    scores = vectors @ profile if len(rows) else []
+    return [(row[0], round(float(score), 4)) for row, score in zip(rows, scores)]
+
+
+def write_scores(db: Session, scores: List[Tuple[int, float]]):
+    """Persist one chunk of scores with a single statement."""
+    if not scores:
+        return
+    if db.bind.dialect.name == "postgresql":
+        values = ", ".join(f"(:id{i}, :score{i})" for i in range(len(scores)))
+        params = {}
+        for i, (sponsor_id, score) in enumerate(scores):
+            params[f"id{i}"] = sponsor_id
+            params[f"score{i}"] = score
+        db.execute(
+            text(
+                "UPDATE sponsors SET relevance_score = v.score "
+                f"FROM (VALUES {values}) AS v(id, score) "
+                "WHERE sponsors.id = v.id"
+            ),
+            params,
+        )
+    else:
+        db.execute(
+            text("UPDATE sponsors SET relevance_score = :score WHERE id = :id"),
+            [{"id": sponsor_id, "score": score} for sponsor_id, score in scores],
+        )
+    db.commit()
+
+
+class ScoreJob:
+    def __init__(self, organization_id: Optional[int], profile_text: str):
+        self.id = uuid.uuid4().hex
+        self.organization_id = organization_id
+        self.profile_text = profile_text
+        self.status = "queued"
+        self.total = 0
+        self.processed = 0
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "total": self.total,
+            "processed": self.processed,
+            "progress": round(self.processed / self.total, 4) if self.total else (1.0 if self.status == "completed" else 0.0),
+            "rows_per_sec": round(self.processed / elapsed, 1) if elapsed else 0.0,
+            "elapsed_seconds": round(elapsed, 3) if elapsed is not None else None,
+            "created_at": self.created_at,
+            "error": self.error,
+        }
+
+
+class ScoreJobRunner:
+    """
+    Runs relevance-score jobs off the request thread.
+
+    A small thread pool coordinates jobs; each job splits the organization's
+    sponsors into chunks (keyset-paged by id), scores them in a process pool
+    and writes each finished chunk back with one UPDATE.
+    """
+
+    def __init__(self, chunk_size: int, workers: int):
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self._jobs: dict[str, ScoreJob] = {}
+        self._lock = threading.Lock()
+        self._coordinator = ThreadPoolExecutor(max_workers=2, thread_name_prefix="score-jobs")
+        self._processes: Optional[ProcessPoolExecutor] = None
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._processes is None:
+                # spawn: forking a threaded server process is not safe
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._processes
+
+    def submit(self, organization_id: Optional[int], profile_text: str) -> ScoreJob:
+        job = ScoreJob(organization_id, profile_text)
+        with self._lock:
+            self._jobs[job.id] = job
+            # Forget the oldest finished jobs beyond the history limit
+            finished = [j for j in self._jobs.values() if j.finished_at is not None]
+            for old_job in finished[:max(0, len(self._jobs) - MAX_JOB_HISTORY)]:
+                del self._jobs[old_job.id]
+        self._coordinator.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[ScoreJob]:
+        return self._jobs.get(job_id)
+
+    def _chunks(self, db: Session, job: ScoreJob):
+        last_id = 0
+        while True:
+            rows = db.query(Sponsor.id, Sponsor.name, Sponsor.industry, Sponsor.notes).filter(
+                Sponsor.organization_id == job.organization_id,
+                Sponsor.id > last_id
+            ).order_by(Sponsor.id).limit(self.chunk_size).all()
+            if not rows:
+                return
+            last_id = rows[-1].id
+            yield [tuple(row) for row in rows]
+
+    def _write(self, db: Session, job: ScoreJob, futures):
+        for future in futures:
+            scores = future.result()
+            write_scores(db, scores)
+            job.processed += len(scores)
+
+    def _run(self, job: ScoreJob):
+        db = SessionLocal()
+        try:
+            job.status = "running"
+            job.started_at = time.monotonic()
+            job.total = db.query(Sponsor).filter(Sponsor.organization_id == job.organization_id).count()
+
+            # Keep a bounded number of chunks in flight so memory stays flat
+            pool = self._process_pool()
+            pending = set()
+            for chunk in self._chunks(db, job):
+                pending.add(pool.submit(score_chunk, chunk, job.profile_text, settings.sponsor_index_dim))
+                if len(pending) >= 2 * self.workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self._write(db, job, done)
+            self._write(db, job, wait(pending).done)
+
+            job.status = "completed"
+        except Exception as exc:
+            db.rollback()
+            job.status = "failed"
+            job.error = str(exc)
+        finally:
+            job.finished_at = time.monotonic()
+            db.close()
+
+
+score_jobs = ScoreJobRunner(settings.score_job_chunk_size, settings.score_job_workers)
@@ -0,0 +1,77 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, List
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.sponsor import Sponsor, SponsorStatus as SponsorStatusColumn, SponsorTier as SponsorTierColumn
+from app.schemas.sponsor import SponsorBulkPatch, SponsorCreate
+
+# Columns a PUT replaces on an existing sponsor; the conflict key and id stay
+UPSERT_FIELDS = [name for name in SponsorCreate.model_fields if name != "contact_email"]
+
+sponsors = Sponsor.__table__
+
+
+def column_values(fields: dict) -> dict:
+    """Schema field values as the columns store them: model enums, which are distinct from the schema ones."""
+    values = dict(fields)
+    if values.get("tier") is not None:
+        values["tier"] = SponsorTierColumn[values["tier"].name]
+    if values.get("status") is not None:
+        values["status"] = SponsorStatusColumn[values["status"].name]
+    return values
+
+
+async def organization_sponsor_ids(db: AsyncSession, organization_id, ids: Iterable[int]) -> set:
+    return set((await db.execute(
+        select(Sponsor.id).where(Sponsor.id.in_(list(ids)), Sponsor.organization_id == organization_id)
+    )).scalars())
+
+
+async def patch_sponsors(db: AsyncSession, patches: List[SponsorBulkPatch]) -> list:
+    """
+    Apply partial updates to sponsors by id and return the updated rows.
+
+    Patches touching the same set of fields share one executemany UPDATE, so
+    a batch costs at most one statement per distinct field set (bounded by
+    the SponsorUpdate fields), not one per sponsor. Does not commit.
+    """
+    groups = defaultdict(list)
+    for patch in patches:
+        fields = column_values(patch.model_dump(exclude_unset=True, exclude={"id"}))
+        if fields:
+            groups[frozenset(fields)].append({"sponsor_id": patch.id, **fields})
+    # SET columns come from the parameter keys; updated_at from its onupdate
+    statement = update(sponsors).where(sponsors.c.id == bindparam("sponsor_id"))
+    for params in groups.values():
+        await db.execute(statement, params)
+
+    return (await db.execute(
+        select(sponsors).where(sponsors.c.id.in_([patch.id for patch in patches]))
+    )).all()
+
+
+async def upsert_sponsors(db: AsyncSession, organization_id, items: List[SponsorCreate]) -> list:
+    """
+    Insert sponsors, replacing those whose contact email the organization already has.
+
+    One INSERT ... ON CONFLICT (organization_id, contact_email) DO UPDATE for
+    the whole batch (batched into multi-row VALUES by the driver), returning
+    the resulting rows in the order of `items`. Does not commit.
+
+    `organization_id` must not be None: NULLs never equal each other, so
+    they would never hit the conflict target and every item would insert.
+    """
+    if not items:
+        return []
+    insert = postgresql_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    statement = insert(sponsors)
+    statement = statement.on_conflict_do_update(
+        index_elements=[sponsors.c.organization_id, sponsors.c.contact_email],
+        # onupdate does not fire for ON CONFLICT, so updated_at is set here
+        set_={**{name: statement.excluded[name] for name in UPSERT_FIELDS}, "updated_at": datetime.utcnow()},
+    ).returning(*sponsors.c, sort_by_parameter_order=True)
+    params = [column_values({**item.model_dump(), "organization_id": organization_id}) for item in items]
+    return (await db.execute(statement, params)).all()
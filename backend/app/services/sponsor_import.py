@@ -0,0 +1,207 @@
+import codecs
+import csv
+from typing import AsyncIterator, Callable, List, Tuple
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import and_, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.models.sponsor import Sponsor
+from app.schemas.sponsor import SponsorCreate, SponsorImportError, SponsorImportResponse
+from app.services.sponsor_bulk import column_values
+from app.services.sponsor_matcher import index_sponsors
+
+# Built once: constructing a TypeAdapter compiles the validator
+sponsor_adapter = TypeAdapter(SponsorCreate)
+
+MAX_REPORTED_ERRORS = 1000
+# A chunk is written again once after losing a race with a concurrent write
+WRITE_ATTEMPTS = 2
+
+
+# ---------- Upload parsing ----------
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decoded lines of a streamed body, line endings stripped."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()  # drops the BOM spreadsheet exports add
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """(line number, JSON text) for every non-blank line."""
+    line_number = 0
+    async for line in _lines(chunks):
+        line_number += 1
+        if line.strip():
+            yield line_number, line
+
+
+async def csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, dict]]:
+    """
+    (line number, row dict) for every CSV record after the header row.
+
+    Quoted fields may contain newlines: lines are joined until the quotes
+    balance. Empty cells are left out so optional fields fall back to
+    their defaults.
+    """
+    header = None
+    record, quotes, start, line_number = [], 0, 0, 0
+    async for line in _lines(chunks):
+        line_number += 1
+        if not record:
+            start = line_number
+        record.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        values = next(csv.reader(["\n".join(record)]), [])
+        record, quotes = [], 0
+        if header is None:
+            header = [name.strip() for name in values]
+        elif any(values):
+            yield start, {name: value for name, value in zip(header, values) if value != ""}
+
+
+def parse_ndjson(raw: str) -> SponsorCreate:
+    return sponsor_adapter.validate_json(raw)
+
+
+def parse_csv(raw: dict) -> SponsorCreate:
+    return sponsor_adapter.validate_python(raw)
+
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in exc.errors()
+    )
+
+
+# ---------- Import ----------
+
+class _Import:
+    def __init__(self, db: AsyncSession, organization_id):
+        self.db = db
+        self.organization_id = organization_id
+        self.report = SponsorImportResponse(received=0, imported=0, failed=0, errors=[])
+
+    def fail(self, row: int, error: str):
+        self.report.failed += 1
+        if len(self.report.errors) < MAX_REPORTED_ERRORS:
+            self.report.errors.append(SponsorImportError(row=row, error=error))
+
+    @staticmethod
+    def validate(raws: List[Tuple[int, object]], parse: Callable) -> Tuple[list, list]:
+        valid, invalid = [], []
+        for row, raw in raws:
+            try:
+                valid.append((row, parse(raw)))
+            except ValidationError as exc:
+                invalid.append((row, _describe(exc)))
+        return valid, invalid
+
+    async def _existing(self, batch) -> Tuple[set, set]:
+        """Emails already used in this organization and names used anywhere, in one query."""
+        emails = {sponsor.contact_email for _, sponsor in batch}
+        names = {sponsor.name for _, sponsor in batch}
+        rows = (await self.db.execute(
+            select(Sponsor.organization_id, Sponsor.contact_email, Sponsor.name).where(or_(
+                and_(Sponsor.organization_id == self.organization_id, Sponsor.contact_email.in_(emails)),
+                Sponsor.name.in_(names),
+            ))
+        )).all()
+        return (
+            {row.contact_email for row in rows if row.organization_id == self.organization_id},
+            {row.name for row in rows},
+        )
+
+    async def _partition(self, batch) -> Tuple[list, list]:
+        """(accepted (row, column values), rejected (row, error)) against the sponsors stored now."""
+        taken_emails, taken_names = await self._existing(batch)
+        accepted, rejected = [], []
+        for row, sponsor in batch:
+            if sponsor.contact_email in taken_emails:
+                rejected.append((row, "Sponsor with this email already exists"))
+            elif sponsor.name in taken_names:
+                rejected.append((row, "Sponsor with this name already exists"))
+            else:
+                # Later rows in the upload with the same keys are duplicates too
+                taken_emails.add(sponsor.contact_email)
+                taken_names.add(sponsor.name)
+                accepted.append((row, column_values({**sponsor.model_dump(), "organization_id": self.organization_id})))
+        return accepted, rejected
+
+    async def _insert(self, accepted) -> list:
+        if not accepted:
+            return []
+        # Core insert on the table: executemany batches it into multi-row
+        # INSERT ... VALUES without the ORM's per-row bookkeeping
+        inserted = (await self.db.execute(
+            insert(Sponsor.__table__).returning(Sponsor.id, Sponsor.name, Sponsor.industry, Sponsor.notes),
+            [values for _, values in accepted]
+        )).all()
+        await self.db.commit()
+        return inserted
+
+    async def chunk(self, raws: List[Tuple[int, object]], parse: Callable):
+        self.report.received += len(raws)
+        # Validation is CPU-bound; keep it off the event loop
+        batch, invalid = await run_in_threadpool(self.validate, raws, parse)
+        for row, error in invalid:
+            self.fail(row, error)
+        if not batch:
+            return
+
+        # Rows are reported only for the attempt that settles the chunk
+        for _ in range(WRITE_ATTEMPTS):
+            accepted, rejected = await self._partition(batch)
+            try:
+                inserted = await self._insert(accepted)
+                break
+            except IntegrityError:
+                # A concurrent write took a name or email between the check and the
+                # insert; the next attempt's existence query sees it and rejects those rows.
+                await self.db.rollback()
+        else:
+            # Still racing: report the chunk rather than fail the whole upload
+            inserted = []
+            rejected += [(row, "Sponsor conflicts with a concurrent write") for row, _ in accepted]
+        for row, error in rejected:
+            self.fail(row, error)
+        self.report.imported += len(inserted)
+        await run_in_threadpool(index_sponsors, inserted)
+
+
+async def import_sponsor_records(
+    db: AsyncSession,
+    records: AsyncIterator[Tuple[int, object]],
+    parse: Callable,
+    organization_id,
+    chunk_size: int,
+) -> SponsorImportResponse:
+    """
+    Validate and insert streamed upload records, `chunk_size` at a time.
+
+    Each chunk costs one existence query and one multi-row INSERT, and is
+    committed on its own, so memory stays flat however large the upload
+    and rows that fail are reported by line number without stopping the
+    rest.
+    """
+    job = _Import(db, organization_id)
+    raws = []
+    async for record in records:
+        raws.append(record)
+        if len(raws) >= chunk_size:
+            await job.chunk(raws, parse)
+            raws = []
+    if raws:
+        await job.chunk(raws, parse)
+    job.report.errors.sort(key=lambda error: error.row)
+    return job.report
@@ -1,26 +1,281 @@
-import random
-from typing import List
-from app.models.sponsor import Sponsor
-from app.schemas.sponsor import SponsorMatchRequest, SponsorMatchResponse
+import threading
+import time
+from typing import Iterator, List, Optional
+import numpy as np
+from sqlalchemy import func
+from app.ai_engine.ann import ANNCache
+from app.ai_engine.embedding_service import embedding_service
+from app.ai_engine.ranking import top_k
+from app.ai_engine.tfidf import TfidfIndex, sponsor_document, request_document
+from app.ai_engine.vector_index import get_sponsor_index
+from app.config import settings
+from app.models.sponsor import Sponsor, SponsorStatus
+from app.schemas.sponsor import MatchReason, SponsorMatchRequest, SponsorMatchResponse
+from app.services.match_cache import match_cache
 from sqlalchemy.orm import Session
 
+MATCH_REASON_TERMS = 3
+# Sponsors an organization can be matched with; inactive ones are never suggested
+MATCHABLE_STATUSES = (SponsorStatus.ACTIVE, SponsorStatus.PENDING)
+
+
+class _OrganizationIndex:
+    __slots__ = ("fingerprint", "checked_at", "index", "names")
+
+    def __init__(self):
+        self.fingerprint = None
+        self.checked_at = 0.0
+        self.index: TfidfIndex | None = None
+        self.names = np.empty(0, dtype=object)
+
+
+class _IndexCache:
+    """
+    Per-process TF-IDF indexes, one per organization, over its matchable sponsors.
+
+    Each organization's rows are fingerprinted with (count, max(updated_at))
+    so that writes made by any worker are picked up without loading every
+    row on each request, and its index is rebuilt only when that changes.
+    The fingerprint query runs at most every `refresh_seconds` per
+    organization; writes through this worker force an immediate re-check.
+    The index ids are also the candidate set of the vector engines.
+    """
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._organizations: dict[Optional[int], _OrganizationIndex] = {}
+
+    def invalidate(self):
+        with self._lock:
+            for entry in self._organizations.values():
+                entry.checked_at = 0.0
+
+    def get(self, db: Session, organization_id: Optional[int]):
+        with self._lock:
+            entry = self._organizations.setdefault(organization_id, _OrganizationIndex())
+        now = time.monotonic()
+        if entry.index is not None and now - entry.checked_at < self.refresh_seconds:
+            return entry.index, entry.names
+
+        # Any write bumps updated_at, including a status change out of MATCHABLE_STATUSES
+        fingerprint = tuple(db.query(func.count(Sponsor.id), func.max(Sponsor.updated_at)).filter(
+            Sponsor.organization_id == organization_id
+        ).one())
+        entry.checked_at = now
+        with self._lock:
+            if entry.index is None or fingerprint != entry.fingerprint:
+                rows = db.query(Sponsor.id, Sponsor.name, Sponsor.industry, Sponsor.notes).filter(
+                    Sponsor.organization_id == organization_id,
+                    Sponsor.status.in_(MATCHABLE_STATUSES)
+                ).order_by(Sponsor.id).all()
+                entry.index = TfidfIndex(
+                    [row.id for row in rows],
+                    (sponsor_document(row.name, row.industry, row.notes) for row in rows),
+                )
+                entry.names = np.array([row.name for row in rows], dtype=object)
+                entry.fingerprint = fingerprint
+            return entry.index, entry.names
+
+
+_index_cache = _IndexCache(settings.sponsor_index_refresh_seconds)
+_ann_cache = ANNCache()
+
+
+# ---------- Persistent vector index maintenance ----------
+
+def index_sponsor(sponsor: Sponsor):
+    """Write the sponsor's current embedding into the shared on-disk index."""
+    vector = embedding_service.embed_one(sponsor_document(sponsor.name, sponsor.industry, sponsor.notes))
+    get_sponsor_index().upsert(sponsor.id, vector)
+    _index_cache.invalidate()
+
+
+def index_sponsors(rows):
+    """``index_sponsor`` for many rows (anything with id, name, industry, notes), embedded as one batch."""
+    if not rows:
+        return
+    vectors = embedding_service.embed(sponsor_document(row.name, row.industry, row.notes) for row in rows)
+    get_sponsor_index().upsert_many((row.id for row in rows), vectors)
+    _index_cache.invalidate()
+
+
+def unindex_sponsor(sponsor_id: int):
+    get_sponsor_index().delete(sponsor_id)
+    _index_cache.invalidate()
+
+
+def rebuild_sponsor_index(db: Session):
+    rows = db.query(Sponsor.id, Sponsor.name, Sponsor.industry, Sponsor.notes).order_by(Sponsor.id).all()
+    vectors = embedding_service.embed(sponsor_document(row.name, row.industry, row.notes) for row in rows)
+    get_sponsor_index().rebuild((row.id for row in rows), vectors)
+
+
 class SponsorMatcher:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, organization_id: Optional[int] = None):
         self.db = db
+        self.organization_id = organization_id
 
     def match_sponsors(self, request: SponsorMatchRequest) -> List[SponsorMatchResponse]:
-        sponsors = self.db.query(Sponsor).all()
-
-        matches = []
-        for sponsor in sponsors:
-            score = round(random.uniform(0.4, 0.98), 2)  # simulate AI ranking
-            matches.append(
-                SponsorMatchResponse(
-                    sponsor_id=sponsor.id,
-                    sponsor_name=sponsor.name,
-                    relevance_score=score
-                )
+        return self.match_sponsors_batch([request])[0]
+
+    def match_sponsors_batch(self, requests: List[SponsorMatchRequest]) -> List[List[SponsorMatchResponse]]:
+        """
+        Rank sponsors for several events at once, in request order.
+
+        Cached results are served first. The remaining requests are grouped by
+        engine and each group is scored with a single query-matrix x
+        sponsor-matrix product, so the sponsor features are loaded and walked
+        once per batch rather than once per event.
+        """
+        results: List[List[SponsorMatchResponse]] = [[] for _ in requests]
+        keys = [match_cache.key(request, self.organization_id) for request in requests]
+        by_engine: dict[str, List[int]] = {}
+        for position, request in enumerate(requests):
+            cached = match_cache.get(keys[position])
+            if cached is not None:
+                results[position] = list(cached)
+                continue
+            by_engine.setdefault(request.engine or settings.sponsor_match_engine, []).append(position)
+
+        for engine, positions in by_engine.items():
+            batch = [requests[position] for position in positions]
+            if engine in ("index", "ann"):
+                ranked = self._match_with_vector_index(batch, engine)
+            else:
+                ranked = self._match_with_tfidf(batch)
+            for position, matches in zip(positions, ranked):
+                match_cache.set(keys[position], matches)
+                results[position] = list(matches)
+        return results
+
+    def stream_matches(self, request: SponsorMatchRequest, chunk_size: int = 1000) -> Iterator[List[SponsorMatchResponse]]:
+        """
+        Ranked matches in chunks of `chunk_size`, best first, for streaming.
+
+        Scoring and ranking happen before this returns; response objects are
+        built one chunk at a time as the iterator is consumed, so memory holds
+        the score vector plus a single chunk however many sponsors are ranked.
+        """
+        engine = request.engine or settings.sponsor_match_engine
+        index, names = _index_cache.get(self.db, self.organization_id)
+        if engine == "tfidf":
+            text = request_document(request)
+            scores = index.score(text)
+            order = top_k(scores, request.top_k)
+            return self._tfidf_chunks(index, names, text, order, scores[order], chunk_size)
+
+        if engine == "index":
+            vector_index = get_sponsor_index()
+            if len(vector_index) == 0:
+                rebuild_sponsor_index(self.db)
+            ids, scores = vector_index.search(
+                embedding_service.embed_one(request_document(request)), sponsor_ids=index.ids
+            )
+            order = top_k(scores, request.top_k)
+            return self._hydrated_chunks(ids[order], scores[order], index, names, chunk_size)
+
+        # ANN results are a bounded shortlist already
+        matches = self.match_sponsors(request)
+        return (matches[start:start + chunk_size] for start in range(0, len(matches), chunk_size))
+
+    @staticmethod
+    def _tfidf_responses(index: TfidfIndex, names, text: str, rows, scores) -> List[SponsorMatchResponse]:
+        # Reasons come from the hits' rows of the matrix that produced the scores
+        reasons = index.explain(text, rows, MATCH_REASON_TERMS)
+        return [
+            SponsorMatchResponse(
+                sponsor_id=int(index.ids[row]),
+                sponsor_name=names[row],
+                relevance_score=round(float(score), 4),
+                match_reasons=[MatchReason(term=term, weight=round(weight, 4)) for term, weight in row_reasons]
+            )
+            for row, score, row_reasons in zip(rows, scores, reasons)
+        ]
+
+    def _tfidf_chunks(self, index: TfidfIndex, names, text: str, rows, scores, chunk_size: int) -> Iterator[List[SponsorMatchResponse]]:
+        for start in range(0, len(rows), chunk_size):
+            end = start + chunk_size
+            yield self._tfidf_responses(index, names, text, rows[start:end], scores[start:end])
+
+    @staticmethod
+    def _hydrated_chunks(ids, scores, index: TfidfIndex, names, chunk_size: int) -> Iterator[List[SponsorMatchResponse]]:
+        # Responses are built one chunk at a time, as the chunk is emitted
+        for start in range(0, len(ids), chunk_size):
+            yield SponsorMatcher._vector_responses(index, names, ids[start:start + chunk_size], scores[start:start + chunk_size])
+
+    @staticmethod
+    def _vector_responses(index: TfidfIndex, names, ids, scores) -> List[SponsorMatchResponse]:
+        # Names come from the organization's candidate set, which the ids were restricted to
+        rows = np.searchsorted(index.ids, ids)
+        return [
+            SponsorMatchResponse(
+                sponsor_id=int(sponsor_id),
+                sponsor_name=names[row],
+                relevance_score=round(float(score), 4)
             )
+            for sponsor_id, row, score in zip(ids, rows, scores)
+        ]
+
+    def _match_with_tfidf(self, requests: List[SponsorMatchRequest]) -> List[List[SponsorMatchResponse]]:
+        index, names = _index_cache.get(self.db, self.organization_id)
+        max_candidates = int(settings.match_prefilter_max_fraction * len(index))
+
+        # Selective requests are scored from the inverted index's posting lists
+        results: List[List[SponsorMatchResponse]] = [[] for _ in requests]
+        full_scan = []
+        texts = [request_document(request) for request in requests]
+        for position, request in enumerate(requests):
+            prefiltered = None
+            if request.top_k is not None:
+                prefiltered = index.score_candidates(texts[position], max_candidates)
+            # Fewer candidates than top_k: fall back so zero-score sponsors still fill the list
+            if prefiltered is None or len(prefiltered[0]) < request.top_k:
+                full_scan.append(position)
+                continue
+            rows, scores = prefiltered
+            order = top_k(scores, request.top_k)
+            results[position] = self._tfidf_responses(index, names, texts[position], rows[order], scores[order])
+
+        if full_scan:
+            scores = index.score_many([texts[position] for position in full_scan])
+            for position, event_scores in zip(full_scan, np.ascontiguousarray(scores.T)):
+                # Only the top_k winners are selected, sorted and materialized
+                order = top_k(event_scores, requests[position].top_k)
+                results[position] = self._tfidf_responses(index, names, texts[position], order, event_scores[order])
+        return results
+
+    def _match_with_vector_index(self, requests: List[SponsorMatchRequest], engine: str) -> List[List[SponsorMatchResponse]]:
+        # Only the organization's matchable sponsors are candidates; the
+        # on-disk index is shared by every organization
+        candidates, names = _index_cache.get(self.db, self.organization_id)
+        index = get_sponsor_index()
+        if len(index) == 0:
+            rebuild_sponsor_index(self.db)
+        if len(index) == 0 or len(candidates) == 0:
+            return [[] for _ in requests]
+
+        queries = embedding_service.embed(request_document(request) for request in requests)
+        # The IVF lists hold every organization's sponsors, so a small
+        # organization has few rows in the probed lists; scoring its
+        # candidates exactly is both cheaper and complete
+        if engine == "ann" and len(candidates) > settings.ann_exact_max_candidates:
+            # Without top_k, ANN returns its whole exactly re-scored shortlist
+            ranked = [
+                _ann_cache.search(
+                    index, query, k=request.top_k or settings.ann_rerank,
+                    nlist=settings.ann_nlist, m=settings.ann_pq_m,
+                    nprobe=request.nprobe or settings.ann_nprobe, rerank=settings.ann_rerank,
+                    sponsor_ids=candidates.ids,
+                )
+                for request, query in zip(requests, queries)
+            ]
+        else:
+            ids, scores = index.search(queries, sponsor_ids=candidates.ids)
+            scores = np.ascontiguousarray(scores.T)
+            ranked = []
+            for request, event_scores in zip(requests, scores):
+                order = top_k(event_scores, request.top_k)
+                ranked.append((ids[order], event_scores[order]))
 
-        # Sort by highest score
-        return sorted(matches, key=lambda x: x.relevance_score, reverse=True)
+        return [self._vector_responses(candidates, names, ids, scores) for ids, scores in ranked]
@@ -0,0 +1,48 @@
+import re
+from typing import List
+from sqlalchemy import Float, cast, column, false, func, literal, literal_column, table
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from app.models.sponsor import Sponsor
+
+SEARCH_CONFIG = "english"
+# bm25 column weights for (name, industry, notes), mirroring the A/B/C tsvector weights
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+_TERM = re.compile(r"\w+")
+
+search_vector = literal_column("sponsors.search_vector", TSVECTOR)
+sponsors_fts = table("sponsors_fts", column("rowid"))
+_fts_match = literal_column("sponsors_fts")
+
+
+def search_terms(text: str) -> List[str]:
+    """Words of a user query; operators and punctuation are dropped, not interpreted."""
+    return _TERM.findall(text.lower())
+
+
+def apply_search(query, text: str, dialect: str):
+    """
+    Narrow a ``select(Sponsor)`` to sponsors matching every word of `text`.
+
+    Returns ``(query, rank)`` where higher `rank` is more relevant, for the
+    caller to order and page by. Postgres matches the GIN-indexed
+    ``sponsors.search_vector`` and ranks with ts_rank_cd; SQLite matches the
+    ``sponsors_fts`` FTS5 table and ranks with bm25. Both stem English words
+    and weight name over industry over notes.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return query.where(false()), literal(0.0, Float)
+
+    if dialect == "postgresql":
+        tsquery = func.plainto_tsquery(SEARCH_CONFIG, " ".join(terms))
+        # ts_rank_cd returns real; cursors carry the rank as a float8, so the
+        # keyset comparison is made at that precision or rows repeat or drop
+        rank = cast(func.ts_rank_cd(search_vector, tsquery), Float(53))
+        return query.where(search_vector.op("@@")(tsquery)), rank
+
+    # Quoted, every term is a plain token to FTS5 rather than query syntax
+    match = " ".join(f'"{term}"' for term in terms)
+    rank = -func.bm25(_fts_match, *BM25_WEIGHTS, type_=Float)
+    query = query.join(sponsors_fts, sponsors_fts.c.rowid == Sponsor.id).where(_fts_match.op("MATCH")(match))
+    return query, rank
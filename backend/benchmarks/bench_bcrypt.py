@@ -0,0 +1,66 @@
+# benchmarks/bench_bcrypt.py
+"""
+bcrypt throughput on this machine at each cost, and the cost calibration picks.
+
+    python -m benchmarks.bench_bcrypt --rounds 8 14 --threads 4 --target-ms 100
+
+Reports single-core verifies/sec per cost, plus the aggregate rate with
+--threads concurrent workers (bcrypt releases the GIL, so this is what the
+password-hashing executor can sustain).
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+from app.core.security import calibrate_bcrypt_rounds, time_bcrypt
+
+
+def _rate(rounds: int, threads: int, per_thread: int) -> float:
+    context = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=rounds)
+    hashed = context.hash("benchmark")
+
+    def work(_):
+        for _ in range(per_thread):
+            context.verify("benchmark", hashed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(work, range(threads)))
+    return threads * per_thread / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, nargs=2, default=[8, 14], metavar=("MIN", "MAX"))
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--target-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    results = []
+    for rounds in range(args.rounds[0], args.rounds[1] + 1):
+        verify_ms = time_bcrypt(rounds) * 1000
+        # Enough verifies per thread for about half a second of work
+        per_thread = max(1, int(500 / verify_ms))
+        results.append({
+            "rounds": rounds,
+            "verify_ms": round(verify_ms, 2),
+            "per_core_per_sec": round(1000 / verify_ms, 1),
+            "threads": args.threads,
+            "aggregate_per_sec": round(_rate(rounds, args.threads, per_thread), 1),
+        })
+
+    print(json.dumps({
+        "cpu_count": os.cpu_count(),
+        "target_ms": args.target_ms,
+        "calibrated_rounds": calibrate_bcrypt_rounds(args.target_ms),
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# benchmarks/bench_indexes.py
+"""
+EXPLAIN plans and timings of the hot list queries before and after their index migrations.
+
+    python -m benchmarks.bench_indexes --sponsors 200000 --activities 500000
+    python -m benchmarks.bench_indexes --database-url postgresql://user:pw@localhost/scratch
+
+Seeds a fresh database (SQLite in a temp dir by default; a --database-url is
+treated as scratch and its tables are dropped), then runs the queries behind
+list_sponsors and the per-user activity feed twice: with c81f4e2a9d37
+downgraded and after upgrading to it. The organization activity feed is
+measured the same way across a9d5e2f41c73: the join through users before,
+the activity_logs.organization_id range after. Each query reports its plan
+(EXPLAIN QUERY PLAN on SQLite, EXPLAIN ANALYZE on Postgres) and p50/p95
+wall time. The trigram index only exists on Postgres, so ?search= only
+changes plan there.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+import numpy as np
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.pagination import encode_cursor, keyset_page
+from app.models.organization import Organization
+from app.models.sponsor import Sponsor
+from app.models.user import ActivityLog, User
+from benchmarks.synthetic import sponsor_rows
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BEFORE_REVISION = "3f9b1c7d2a64"
+AFTER_REVISION = "c81f4e2a9d37"
+ORGANIZATION_FEED_BEFORE_REVISION = "f3c91a7b2e48"
+ORGANIZATION_FEED_AFTER_REVISION = "a9d5e2f41c73"
+INSERT_CHUNK = 50000
+PAGE = 20
+# activity_logs columns that predate a9d5e2f41c73, so the feeds run on either schema
+ACTIVITY_COLUMNS = (ActivityLog.id, ActivityLog.user_id, ActivityLog.action, ActivityLog.timestamp)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def seed_database(engine, sponsors: int, users: int, activities: int, organizations: int, seed: int):
+    for metadata in {ActivityLog.metadata, Sponsor.metadata}:
+        metadata.drop_all(engine)
+        metadata.create_all(engine)
+
+    rng = random.Random(seed)
+    rows = sponsor_rows(sponsors, seed=seed)
+    for i, row in enumerate(rows):
+        row["organization_id"] = i % organizations + 1
+        row["relevance_score"] = round(rng.random(), 4)
+
+    start = datetime(2025, 1, 1)
+    db = sessionmaker(bind=engine)()
+    for chunk in range(0, sponsors, INSERT_CHUNK):
+        db.bulk_insert_mappings(Sponsor, rows[chunk:chunk + INSERT_CHUNK])
+    db.bulk_insert_mappings(Organization, [
+        {"id": i + 1, "name": f"Organization {i + 1}"} for i in range(organizations)
+    ])
+    db.bulk_insert_mappings(User, [
+        {"email": f"user{i}@example.com", "full_name": f"User {i}", "hashed_password": "x",
+         "organization_id": i % organizations + 1}
+        for i in range(users)
+    ])
+    for chunk in range(0, activities, INSERT_CHUNK):
+        db.bulk_insert_mappings(ActivityLog, [
+            {
+                "user_id": rng.randint(1, users),
+                "action": "login",
+                "timestamp": start + timedelta(seconds=rng.randrange(365 * 86400)),
+            }
+            for _ in range(chunk, min(chunk + INSERT_CHUNK, activities))
+        ])
+    db.commit()
+    db.close()
+
+
+def hot_queries(engine, organization_id: int, user_id: int, depth: int) -> dict:
+    """The statements the list endpoints issue, first page and `depth` rows in."""
+    sponsor_key = [Sponsor.relevance_score, Sponsor.id]
+    activity_key = [ActivityLog.timestamp, ActivityLog.id]
+    sponsors = select(Sponsor).where(Sponsor.organization_id == organization_id)
+    activity = select(*ACTIVITY_COLUMNS).where(ActivityLog.user_id == user_id)
+
+    with engine.connect() as conn:
+        deep_sponsor = _cursor_after(conn, sponsors, sponsor_key, depth)
+        deep_activity = _cursor_after(conn, activity, activity_key, depth)
+
+    return {
+        "sponsors_first_page": keyset_page(sponsors, sponsor_key, None, PAGE),
+        "sponsors_deep_page": keyset_page(sponsors, sponsor_key, deep_sponsor, PAGE),
+        "sponsors_search": keyset_page(sponsors.where(Sponsor.name.ilike("%sponsor 123%")), sponsor_key, None, PAGE),
+        "activity_first_page": keyset_page(activity, activity_key, None, PAGE),
+        "activity_deep_page": keyset_page(activity, activity_key, deep_activity, PAGE),
+    }
+
+
+def organization_feed_queries(engine, organization_id: int, depth: int, denormalized: bool) -> dict:
+    """get_organization_activity's statements: joining users before a9d5e2f41c73, its own column after."""
+    activity_key = [ActivityLog.timestamp, ActivityLog.id]
+    feed = select(*ACTIVITY_COLUMNS)
+    if denormalized:
+        feed = feed.where(ActivityLog.organization_id == organization_id)
+    else:
+        feed = feed.join(User, User.id == ActivityLog.user_id).where(User.organization_id == organization_id)
+
+    with engine.connect() as conn:
+        deep_feed = _cursor_after(conn, feed, activity_key, depth)
+
+    return {
+        "organization_activity_first_page": keyset_page(feed, activity_key, None, PAGE),
+        "organization_activity_deep_page": keyset_page(feed, activity_key, deep_feed, PAGE),
+    }
+
+
+def _cursor_after(conn, query, key, depth: int) -> str:
+    """The cursor a client holds after scrolling `depth` rows (or to the last row)."""
+    total = conn.execute(query.with_only_columns(func.count())).scalar()
+    row = conn.execute(
+        query.with_only_columns(*key).order_by(*(c.desc() for c in key)).offset(max(min(depth, total - 1), 0)).limit(1)
+    ).first()
+    return encode_cursor(*row)
+
+
+def explain(conn, query) -> List[str]:
+    sql = str(query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "postgresql":
+        return [row[0] for row in conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"))]
+    return [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+def measure(engine, queries: dict, repeats: int) -> dict:
+    results = {}
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        for name, query in queries.items():
+            samples = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                conn.execute(query).all()
+                samples.append(_ms(time.perf_counter() - start))
+            results[name] = {
+                "p50_ms": round(float(np.percentile(samples, 50)), 3),
+                "p95_ms": round(float(np.percentile(samples, 95)), 3),
+                "plan": explain(conn, query),
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", help="scratch database to seed (default: SQLite in a temp dir)")
+    parser.add_argument("--sponsors", type=int, default=200000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--activities", type=int, default=500000)
+    parser.add_argument("--organizations", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=5000, help="rows scrolled before the deep-page cursor")
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results JSON here as well as to stdout")
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/indexes.db"
+    engine = create_engine(url)
+    start = time.perf_counter()
+    seed_database(engine, args.sponsors, args.users, args.activities, args.organizations, args.seed)
+    seed_s = time.perf_counter() - start
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    # create_all built the indexes and the organization_id column too;
+    # downgrading removes them for the baselines, one migration at a time
+    command.stamp(config, ORGANIZATION_FEED_AFTER_REVISION)
+    command.downgrade(config, ORGANIZATION_FEED_BEFORE_REVISION)
+    command.stamp(config, AFTER_REVISION)
+    command.downgrade(config, BEFORE_REVISION)
+
+    queries = hot_queries(engine, organization_id=1, user_id=1, depth=args.depth)
+    before = measure(engine, queries, args.repeats)
+    command.upgrade(config, AFTER_REVISION)
+    after = measure(engine, queries, args.repeats)
+
+    command.stamp(config, ORGANIZATION_FEED_BEFORE_REVISION)
+    before.update(measure(engine, organization_feed_queries(engine, 1, args.depth, False), args.repeats))
+    command.upgrade(config, ORGANIZATION_FEED_AFTER_REVISION)
+    after.update(measure(engine, organization_feed_queries(engine, 1, args.depth, True), args.repeats))
+
+    report = {
+        "meta": {
+            "dialect": engine.dialect.name,
+            "python": platform.python_version(),
+            "sponsors": args.sponsors,
+            "activities": args.activities,
+            "organizations": args.organizations,
+            "seed_ms": _ms(seed_s),
+        },
+        "results": {
+            name: {"before": before[name], "after": after[name]} for name in after
+        },
+    }
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+# benchmarks/bench_matcher.py
+"""
+Seeded end-to-end benchmark of SponsorMatcher at several table sizes.
+
+    python -m benchmarks.bench_matcher --sizes 10000 100000 1000000 --output bench.json
+    python -m benchmarks.bench_matcher --sizes 10000 100000 --compare bench.json
+
+Every size gets a fresh SQLite database seeded with the same synthetic sponsors
+and the same match requests, so numbers are comparable across commits. Stages
+timed: DB load, feature extraction, scoring, top-k selection, pydantic
+serialization, plus the warm end-to-end SponsorMatcher.match_sponsors call.
+With --compare, exits non-zero if any timing regressed beyond --tolerance.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+_workdir = tempfile.mkdtemp()
+os.environ.setdefault("SPONSOR_INDEX_PATH", f"{_workdir}/sponsor_index")
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.ai_engine import vector_index  # noqa: E402
+from app.ai_engine.ann import ANNCache  # noqa: E402
+from app.ai_engine.ranking import top_k  # noqa: E402
+from app.ai_engine.tfidf import TfidfIndex, request_document, sponsor_document  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.models.sponsor import Sponsor  # noqa: E402
+from app.schemas.sponsor import SponsorMatchRequest, SponsorMatchResponse  # noqa: E402
+from app.services.match_cache import match_cache  # noqa: E402
+from app.services import sponsor_matcher  # noqa: E402
+from app.services.sponsor_matcher import SponsorMatcher  # noqa: E402
+from benchmarks.synthetic import match_requests, sponsor_rows  # noqa: E402
+
+INSERT_CHUNK = 50000
+responses_adapter = TypeAdapter(List[SponsorMatchResponse])
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def _percentiles(samples: List[float]) -> dict:
+    return {
+        "p50": round(float(np.percentile(samples, 50)), 3),
+        "p95": round(float(np.percentile(samples, 95)), 3),
+        "p99": round(float(np.percentile(samples, 99)), 3),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def seed_database(size: int, seed: int):
+    engine = create_engine(f"sqlite:///{_workdir}/sponsors_{size}.db")
+    Sponsor.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    rows = sponsor_rows(size, seed=seed)
+    for start in range(0, size, INSERT_CHUNK):
+        db.bulk_insert_mappings(Sponsor, rows[start:start + INSERT_CHUNK])
+    db.commit()
+    return db
+
+
+def reset_matcher(size: int):
+    """
+    Point the matcher at a fresh vector index directory and drop its caches.
+
+    Sponsor ids repeat across sizes, so an index, IVF-PQ structure or
+    result built for another size would otherwise be served for this one.
+    """
+    settings.sponsor_index_path = f"{_workdir}/sponsor_index_{size}"
+    vector_index._sponsor_index = None
+    sponsor_matcher._index_cache.invalidate()
+    sponsor_matcher._ann_cache = ANNCache()
+    match_cache.invalidate(None)
+
+
+def bench_size(size: int, queries: int, top: int, engine: str, seed: int) -> dict:
+    start = time.perf_counter()
+    db = seed_database(size, seed)
+    seed_s = time.perf_counter() - start
+
+    requests = [
+        SponsorMatchRequest(**payload, engine=engine)
+        for payload in match_requests(queries, seed=seed + 1, top_k=top)
+    ]
+
+    # Stage timings on the TF-IDF path, outside the matcher's caches
+    start = time.perf_counter()
+    rows = db.query(Sponsor.id, Sponsor.name, Sponsor.industry, Sponsor.notes).order_by(Sponsor.id).all()
+    db_load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = TfidfIndex([row.id for row in rows], [sponsor_document(row.name, row.industry, row.notes) for row in rows])
+    features_s = time.perf_counter() - start
+    names = np.array([row.name for row in rows], dtype=object)
+    del rows
+
+    scoring, selection, serialization = [], [], []
+    for request in requests:
+        start = time.perf_counter()
+        scores = index.score(request_document(request))
+        scoring.append(_ms(time.perf_counter() - start))
+
+        start = time.perf_counter()
+        order = top_k(scores, request.top_k)
+        selection.append(_ms(time.perf_counter() - start))
+
+        start = time.perf_counter()
+        matches = [
+            SponsorMatchResponse(
+                sponsor_id=int(index.ids[row]), sponsor_name=names[row], relevance_score=round(float(scores[row]), 4)
+            )
+            for row in order
+        ]
+        responses_adapter.dump_json(matches)
+        serialization.append(_ms(time.perf_counter() - start))
+
+    # Full path through SponsorMatcher: first call pays load + build
+    reset_matcher(size)
+    matcher = SponsorMatcher(db)
+    start = time.perf_counter()
+    matcher.match_sponsors(requests[0])
+    cold_s = time.perf_counter() - start
+
+    end_to_end = []
+    for request in requests[1:]:
+        start = time.perf_counter()
+        responses_adapter.dump_json(matcher.match_sponsors(request))
+        end_to_end.append(_ms(time.perf_counter() - start))
+
+    db.close()
+    return {
+        "size": size,
+        "engine": engine,
+        "queries": queries,
+        "top_k": top,
+        "seed_ms": _ms(seed_s),
+        "db_load_ms": _ms(db_load_s),
+        "features_ms": _ms(features_s),
+        "cold_match_ms": _ms(cold_s),
+        "scoring_ms": _percentiles(scoring),
+        "top_k_ms": _percentiles(selection),
+        "serialization_ms": _percentiles(serialization),
+        "end_to_end_ms": _percentiles(end_to_end),
+        "throughput_qps": round(1000 * len(end_to_end) / sum(end_to_end), 1) if end_to_end else None,
+    }
+
+
+# Timings checked by --compare; seeding is setup, not product code
+COMPARED = ("db_load_ms", "features_ms", "cold_match_ms", "scoring_ms", "top_k_ms", "serialization_ms", "end_to_end_ms")
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Regressions of more than `tolerance` (fraction) against a previous run."""
+    previous = {(r["size"], r["engine"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        before = previous.get((result["size"], result["engine"]))
+        if before is None:
+            continue
+        for metric in COMPARED:
+            now, then = result[metric], before[metric]
+            if isinstance(now, dict):
+                now, then = now["p50"], then["p50"]
+            if then and now > then * (1 + tolerance):
+                regressions.append(
+                    f"{result['engine']} n={result['size']} {metric}: {then} -> {now} ms (+{(now / then - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--engine", default="tfidf", choices=["tfidf", "index", "ann"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results JSON here as well as to stdout")
+    parser.add_argument("--compare", help="previous results JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "seed": args.seed,
+        },
+        "results": [bench_size(size, args.queries, args.top_k, args.engine, args.seed) for size in args.sizes],
+    }
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# benchmarks/bench_search.py
+"""
+Latency of ranked sponsor full-text search against the ILIKE scan it replaced.
+
+    python -m benchmarks.bench_search --sponsors 1000000
+    python -m benchmarks.bench_search --database-url postgresql://user:pw@localhost/scratch
+
+Seeds a fresh database (SQLite with FTS5 in a temp dir by default; a
+--database-url is treated as scratch and its tables are dropped) and runs the
+first page of list_sponsors?search= for single- and multi-word queries of
+varying selectivity, through the same apply_search/keyset_page path as the
+endpoint. The ILIKE baseline matches the same words against name, industry
+and notes.
+"""
+
+import argparse
+import json
+import platform
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+from sqlalchemy import and_, create_engine, func, or_, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.pagination import keyset_page
+from app.models.sponsor import Sponsor
+from app.services.sponsor_search import apply_search, search_terms
+from benchmarks.synthetic import sponsor_rows
+
+INSERT_CHUNK = 50000
+PAGE = 20
+# Common topic, rarer industry word, two-word AND, name token, no match
+QUERIES = ["music", "cosmetics", "running festival", "sponsor 4242", "zeppelin"]
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def seed_database(engine, size: int, seed: int):
+    Sponsor.metadata.drop_all(engine)
+    Sponsor.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    rows = sponsor_rows(size, seed=seed)
+    for row in rows:
+        row["organization_id"] = 1
+    for start in range(0, size, INSERT_CHUNK):
+        db.bulk_insert_mappings(Sponsor, rows[start:start + INSERT_CHUNK])
+    db.commit()
+    db.close()
+
+
+def ilike_page(text: str):
+    fields = (Sponsor.name, Sponsor.industry, Sponsor.notes)
+    words = [or_(*(field.ilike(f"%{term}%") for field in fields)) for term in search_terms(text)]
+    query = select(Sponsor).where(Sponsor.organization_id == 1, and_(*words))
+    return keyset_page(query.add_columns(Sponsor.relevance_score), [Sponsor.relevance_score, Sponsor.id], None, PAGE)
+
+
+def search_page(text: str, dialect: str):
+    query, rank = apply_search(select(Sponsor).where(Sponsor.organization_id == 1), text, dialect)
+    return keyset_page(query.add_columns(rank), [rank, Sponsor.id], None, PAGE)
+
+
+def _timed(conn, query, repeats: int) -> dict:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        rows = conn.execute(query).all()
+        samples.append(_ms(time.perf_counter() - start))
+    return {
+        "rows": len(rows),
+        "p50_ms": round(float(np.percentile(samples, 50)), 3),
+        "p95_ms": round(float(np.percentile(samples, 95)), 3),
+    }
+
+
+def bench(engine, queries: List[str], repeats: int) -> dict:
+    results = {}
+    with engine.connect() as conn:
+        dialect = conn.dialect.name
+        for text in queries:
+            query, _ = apply_search(select(func.count()).select_from(Sponsor), text, dialect)
+            results[text] = {
+                "matches": conn.execute(query).scalar(),
+                "search": _timed(conn, search_page(text, dialect), repeats),
+                "ilike": _timed(conn, ilike_page(text), max(1, repeats // 5)),
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", help="scratch database to seed (default: SQLite in a temp dir)")
+    parser.add_argument("--sponsors", type=int, default=1000000)
+    parser.add_argument("--queries", nargs="+", default=QUERIES)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results JSON here as well as to stdout")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url or f"sqlite:///{tempfile.mkdtemp()}/search.db")
+    start = time.perf_counter()
+    seed_database(engine, args.sponsors, args.seed)
+    seed_s = time.perf_counter() - start
+
+    report = {
+        "meta": {
+            "dialect": engine.dialect.name,
+            "python": platform.python_version(),
+            "sponsors": args.sponsors,
+            "page": PAGE,
+            "seed_ms": _ms(seed_s),
+        },
+        "results": bench(engine, args.queries, args.repeats),
+    }
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
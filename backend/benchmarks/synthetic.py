@@ -0,0 +1,52 @@
+# benchmarks/synthetic.py
+"""Seeded synthetic sponsors and match requests for the benchmark scripts."""
+
+import random
+from typing import List
+
+INDUSTRIES = [
+    "Beverages", "Sportswear", "Music Streaming", "Banking", "Telecom", "Automotive",
+    "Gaming", "Consumer Electronics", "Fashion", "Food Delivery", "Travel", "Insurance",
+    "Education", "Healthcare", "Energy", "Cloud Software", "Outdoor Gear", "Cosmetics",
+]
+
+TOPICS = [
+    "music", "festival", "concert", "marathon", "running", "esports", "hackathon", "startup",
+    "fintech", "sustainability", "climate", "fashion", "film", "food", "wine", "coffee",
+    "travel", "adventure", "cycling", "football", "basketball", "tennis", "yoga", "wellness",
+    "ai", "robotics", "cloud", "security", "education", "students", "campus", "charity",
+    "art", "photography", "design", "gaming", "streaming", "community", "family", "outdoor",
+]
+
+
+def sponsor_rows(n: int, seed: int = 0) -> List[dict]:
+    """Column dicts for `n` sponsors, identical for identical (n, seed)."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        industry = rng.choice(INDUSTRIES)
+        notes = " ".join(rng.sample(TOPICS, rng.randint(3, 8)))
+        rows.append({
+            "name": f"{industry} Sponsor {i}",
+            "industry": industry,
+            "contact_email": f"sponsor{i}@example.com",
+            "notes": f"Interested in {notes} events",
+            "budget": float(rng.randrange(1000, 100000, 500)),
+        })
+    return rows
+
+
+def match_requests(n: int, seed: int = 1, top_k: int = 10) -> List[dict]:
+    """Payloads for `n` SponsorMatchRequests, identical for identical (n, seed)."""
+    rng = random.Random(seed)
+    requests = []
+    for i in range(n):
+        topics = rng.sample(TOPICS, 4)
+        requests.append({
+            "event_name": f"{topics[0].title()} {topics[1].title()} Night {i}",
+            "event_theme": topics[2],
+            "description": f"A {topics[0]} and {topics[3]} event for the {rng.choice(TOPICS)} community",
+            "keywords": topics,
+            "top_k": top_k,
+        })
+    return requests
@@ -0,0 +1,76 @@
+# tests/conftest.py
+
+import os
+import tempfile
+
+# Settings are read at import time: point the app at scratch storage first
+_workdir = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_workdir}/test.db")
+os.environ.setdefault("ASYNC_DATABASE_URL", f"sqlite+aiosqlite:///{_workdir}/test.db")
+os.environ.setdefault("SPONSOR_INDEX_PATH", f"{_workdir}/sponsor_index")
+os.environ.setdefault("TOKEN_REVOCATION_STORE", "memory")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.ai_engine.vector_index import get_sponsor_index  # noqa: E402
+from app.api.deps import get_current_user, get_token_principal  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import base, base_class  # noqa: E402
+from app.database.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services import sponsor_matcher  # noqa: E402
+from app.services.api_keys import api_key_cache  # noqa: E402
+from app.services.match_cache import match_cache  # noqa: E402
+from app.services.principal_cache import Principal, principal_cache, token_state_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """Empty tables, caches and sponsor index for every test."""
+    for metadata in (base.Base.metadata, base_class.Base.metadata):
+        metadata.drop_all(engine)
+        metadata.create_all(engine)
+    for cache in (principal_cache, token_state_cache, api_key_cache, match_cache._cache):
+        cache.clear()
+    sponsor_matcher._index_cache = sponsor_matcher._IndexCache(settings.sponsor_index_refresh_seconds)
+    index = get_sponsor_index()
+    index.rebuild([], np.zeros((0, index.dim), np.float32))
+    yield
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client():
+    with TestClient(app, raise_server_exceptions=False) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def login_as():
+    """Authenticate requests as the given principal, skipping token handling."""
+
+    def login(user_id: int = 1, organization_id: int | None = 1, role: str | None = "marketing_lead",
+              is_admin: bool = False, email: str | None = None) -> Principal:
+        principal = Principal(
+            id=user_id,
+            email=email or f"user{user_id}@example.com",
+            is_active=True,
+            is_admin=is_admin,
+            role=role,
+            organization_id=organization_id,
+        )
+        app.dependency_overrides[get_token_principal] = lambda: principal
+        app.dependency_overrides[get_current_user] = lambda: principal
+        return principal
+
+    return login
@@ -0,0 +1,44 @@
+import numpy as np
+
+from app.ai_engine.ann import ANNCache
+from app.ai_engine.vector_index import SponsorVectorIndex
+
+DIM = 32
+
+
+def _unit(rows: np.ndarray) -> np.ndarray:
+    return (rows / np.linalg.norm(rows, axis=-1, keepdims=True)).astype(np.float32)
+
+
+def test_rows_overwritten_after_the_build_are_scored_exactly(tmp_path):
+    rng = np.random.default_rng(0)
+    index = SponsorVectorIndex(str(tmp_path), DIM)
+    index.upsert_many(range(1, 2001), _unit(rng.standard_normal((2000, DIM))))
+    cache = ANNCache()
+    search = dict(k=1, nlist=16, m=8, nprobe=1, rerank=1)
+
+    query = _unit(rng.standard_normal(DIM))
+    cache.search(index, query, **search)  # builds the IVF-PQ structure
+
+    index.upsert(5, query)
+    ids, scores = cache.search(index, query, **search)
+    assert ids.tolist() == [5]
+    assert np.isclose(scores[0], 1.0, atol=1e-5)
+
+    # Moved away again: the stale copy must not come back either
+    index.upsert_many([5], -query[None, :])
+    ids, _ = cache.search(index, query, k=10, nlist=16, m=8, nprobe=16, rerank=100)
+    assert 5 not in ids.tolist()
+    assert len(ids) == len(set(ids.tolist()))
+
+
+def test_search_is_restricted_to_the_given_sponsors(tmp_path):
+    rng = np.random.default_rng(1)
+    index = SponsorVectorIndex(str(tmp_path), DIM)
+    index.upsert_many(range(1, 501), _unit(rng.standard_normal((500, DIM))))
+    allowed = np.arange(1, 501, 7)
+
+    ids, _ = ANNCache().search(index, _unit(rng.standard_normal(DIM)), k=20, nlist=8, m=8,
+                               nprobe=8, rerank=100, sponsor_ids=allowed)
+    assert len(ids) == 20
+    assert set(ids.tolist()) <= set(allowed.tolist())
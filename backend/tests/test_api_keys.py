@@ -0,0 +1,65 @@
+import pytest
+
+from app.core.security import generate_api_key, hash_api_key
+from app.models.api_key import ApiKey
+from app.models.user import User
+from app.services.api_keys import api_key_cache
+
+SPONSORS_URL = "/api/v1/sponsors/"
+
+
+@pytest.fixture
+def api_key(db):
+    owner = User(email="service@example.com", full_name="Service", hashed_password="x")
+    db.add(owner)
+    db.commit()
+    key, prefix = generate_api_key()
+    db.add(ApiKey(prefix=prefix, key_hash=hash_api_key(key), name="crm", user_id=owner.id, organization_id=1))
+    db.commit()
+    return owner, key
+
+
+def test_api_key_stops_working_when_owner_is_deactivated(client, db, api_key):
+    owner, key = api_key
+    headers = {"X-API-Key": key}
+    assert client.get(SPONSORS_URL, headers=headers).status_code == 200
+
+    owner.is_active = False
+    db.commit()
+    assert client.get(SPONSORS_URL, headers=headers).status_code == 200  # still cached on this worker
+    api_key_cache.clear()
+
+    assert client.get(SPONSORS_URL, headers=headers).status_code == 401
+
+
+def test_deactivating_a_user_drops_their_cached_keys(client, db, api_key, login_as):
+    owner, key = api_key
+    headers = {"X-API-Key": key}
+    assert client.get(SPONSORS_URL, headers=headers).status_code == 200
+
+    login_as(user_id=owner.id, email=owner.email)
+    assert client.put("/api/v1/users/me", json={"is_active": False}).status_code == 200
+    client.app.dependency_overrides.clear()
+
+    assert client.get(SPONSORS_URL, headers=headers).status_code == 401
+
+
+def test_admin_issues_lists_and_revokes_keys(client, db, login_as):
+    admin = User(email="admin@example.com", full_name="Admin", hashed_password="x", is_admin=True)
+    db.add(admin)
+    db.commit()
+    login_as(user_id=admin.id, email=admin.email, is_admin=True)
+
+    response = client.post("/api/v1/api-keys/", json={"name": "crm", "role": "marketing_lead"})
+    assert response.status_code == 201
+    created = response.json()
+    assert [key["name"] for key in client.get("/api/v1/api-keys/").json()] == ["crm"]
+
+    client.app.dependency_overrides.clear()
+    headers = {"X-API-Key": created["key"]}
+    assert client.get(SPONSORS_URL, headers=headers).status_code == 200
+
+    login_as(user_id=admin.id, email=admin.email, is_admin=True)
+    assert client.delete(f"/api/v1/api-keys/{created['id']}").status_code == 204
+    client.app.dependency_overrides.clear()
+    assert client.get(SPONSORS_URL, headers=headers).status_code == 401
@@ -0,0 +1,130 @@
+import pytest
+
+from app.core.security import get_password_hash
+from app.models.user import User
+from app.services.principal_cache import forget_user
+
+LOGIN_URL = "/api/v1/auth/login"
+SPONSORS_URL = "/api/v1/sponsors/"
+
+
+@pytest.fixture
+def user(db):
+    user = User(email="lead@example.com", full_name="Lead", hashed_password=get_password_hash("secret"))
+    db.add(user)
+    db.commit()
+    return user
+
+
+def _bearer(client, password: str = "secret") -> dict:
+    response = client.post(LOGIN_URL, json={"email": "lead@example.com", "password": password})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.mark.parametrize("change", [
+    {"token_version": 1},  # password change
+    {"is_active": False},
+])
+def test_claims_tokens_stop_working_after_user_changes(client, db, user, change):
+    headers = _bearer(client)
+    assert client.get(SPONSORS_URL, headers=headers).status_code == 200
+
+    for field, value in change.items():
+        setattr(user, field, value)
+    db.commit()
+    forget_user(user.email)  # as the user endpoints do after a write
+
+    response = client.get(SPONSORS_URL, headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token has been revoked"
+
+
+def test_change_password_logs_activity_and_revokes_tokens(client, db, user):
+    headers = _bearer(client)
+
+    response = client.post(
+        "/api/v1/users/me/change-password",
+        json={"old_password": "secret", "new_password": "new-secret"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert client.get(SPONSORS_URL, headers=headers).status_code == 401
+
+    headers = _bearer(client, "new-secret")
+    activity = client.get("/api/v1/users/me/activity", headers=headers).json()["items"]
+    assert [entry["action"] for entry in activity] == ["UPDATE_PASSWORD"]
+
+
+def test_change_password_rejects_wrong_password(client, db, user):
+    response = client.post(
+        "/api/v1/users/me/change-password",
+        json={"old_password": "wrong", "new_password": "new-secret"},
+        headers=_bearer(client),
+    )
+    assert response.status_code == 400
+    assert client.get(SPONSORS_URL, headers=_bearer(client)).status_code == 200
+
+
+def test_replayed_refresh_token_loses_the_claim_and_ends_the_family(client, user, monkeypatch):
+    from app.api.v1 import auth
+    from app.core.revocation import MemoryRevocationStore, RevocationList
+
+    store = MemoryRevocationStore()
+    # Two workers, each synced once before either rotates
+    workers = [RevocationList(store, sync_seconds=3600) for _ in range(2)]
+    for worker in workers:
+        worker.sync()
+    monkeypatch.setattr(auth, "token_revocations", workers[0])
+    refresh_token = client.post(LOGIN_URL, json={"email": "lead@example.com", "password": "secret"}).json()["refresh_token"]
+
+    first = client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+    assert first.status_code == 200
+
+    # The replay lands on a worker that has not synced the first rotation
+    monkeypatch.setattr(auth, "token_revocations", workers[1])
+    replay = client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+    assert replay.status_code == 401
+
+    rotated = client.post("/api/v1/auth/refresh", json={"refresh_token": first.json()["refresh_token"]})
+    assert rotated.status_code == 401
+
+
+def test_principal_is_cached_and_refreshed_after_profile_update(client, user):
+    headers = _bearer(client)
+    hits = client.get("/health/principal-cache").json()["hits"]
+
+    assert client.get("/api/v1/users/me", headers=headers).json()["full_name"] == "Lead"
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+    assert client.get("/health/principal-cache").json()["hits"] > hits
+
+    assert client.put("/api/v1/users/me", json={"full_name": "Renamed"}, headers=headers).status_code == 200
+    assert client.get("/api/v1/users/me", headers=headers).json()["full_name"] == "Renamed"
+
+
+def test_role_checks_run_from_the_token_claims(client, db, user):
+    from sqlalchemy import event
+    from app.database.session import async_engine
+
+    user.is_admin = True
+    db.commit()
+    headers = _bearer(client)
+    url = "/api/v1/sponsors/match/cache-stats"
+    assert client.get(url, headers=headers).status_code == 200  # caches the token state
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        assert client.get(url, headers=headers).status_code == 200
+        assert statements == []
+
+        # Another worker, say, with nothing cached: only the version is read
+        forget_user(user.email)
+        assert client.get(url, headers=headers).status_code == 200
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    [statement] = statements
+    assert "token_version" in statement and "hashed_password" not in statement
@@ -0,0 +1,37 @@
+from app.ai_engine import vector_index
+from app.config import settings
+from benchmarks import bench_matcher
+from benchmarks.synthetic import match_requests, sponsor_rows
+
+
+def test_synthetic_data_is_seeded():
+    assert sponsor_rows(50, seed=3) == sponsor_rows(50, seed=3)
+    assert sponsor_rows(50, seed=3) != sponsor_rows(50, seed=4)
+    assert match_requests(5, seed=3) == match_requests(5, seed=3)
+
+
+def test_each_size_gets_its_own_matcher_state(monkeypatch):
+    # bench_size repoints the process-wide index; put it back for the other tests
+    monkeypatch.setattr(settings, "sponsor_index_path", settings.sponsor_index_path)
+    monkeypatch.setattr(vector_index, "_sponsor_index", vector_index._sponsor_index)
+
+    result = bench_matcher.bench_size(200, queries=3, top=5, engine="index", seed=0)
+    assert result["size"] == 200
+    assert result["end_to_end_ms"]["p50"] > 0
+    assert len(vector_index.get_sponsor_index()) == 200
+
+    bench_matcher.reset_matcher(100)
+    assert len(vector_index.get_sponsor_index()) == 0
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    def run(end_to_end_p50: float) -> dict:
+        return {"results": [{
+            "size": 100, "engine": "tfidf", "db_load_ms": 1.0, "features_ms": 1.0, "cold_match_ms": 1.0,
+            "scoring_ms": {"p50": 1.0}, "top_k_ms": {"p50": 1.0}, "serialization_ms": {"p50": 1.0},
+            "end_to_end_ms": {"p50": end_to_end_p50},
+        }]}
+
+    assert bench_matcher.compare(run(1.1), run(1.0), tolerance=0.2) == []
+    [regression] = bench_matcher.compare(run(1.5), run(1.0), tolerance=0.2)
+    assert regression.startswith("tfidf n=100 end_to_end_ms")
@@ -0,0 +1,16 @@
+from app.ai_engine import vector_index
+from app.ai_engine.embedding_service import embedding_service
+from app.ai_engine.embeddings import HashingEmbedder
+from app.config import settings
+
+
+def test_sponsor_index_takes_its_width_from_the_embedder(monkeypatch, tmp_path):
+    # e.g. all-MiniLM-L6-v2, whose 384 dims differ from sponsor_index_dim
+    monkeypatch.setattr(embedding_service, "_backend", HashingEmbedder(384))
+    monkeypatch.setattr(vector_index, "_sponsor_index", None)
+    monkeypatch.setattr(settings, "sponsor_index_path", str(tmp_path))
+
+    index = vector_index.get_sponsor_index()
+    assert index.dim == 384
+    index.upsert(1, embedding_service.embed_one("music festival"))
+    assert len(index) == 1
@@ -0,0 +1,20 @@
+from app.config import settings
+
+
+def test_embedding_health_reports_batches(client, login_as):
+    login_as(organization_id=5)
+    client.post("/api/v1/sponsors/", json={"name": "Aco", "contact_email": "a@aco.com", "notes": "music"})
+
+    stats = client.get("/health/embeddings").json()
+    assert stats["backend"] is not None
+    assert stats["batch_size"]["count"] >= 1
+
+
+def test_database_health_reports_both_pools(client, login_as):
+    login_as(organization_id=5)
+    assert client.get("/api/v1/sponsors/").status_code == 200
+
+    stats = client.get("/health/db").json()
+    assert set(stats) == {"sync", "async"}
+    assert stats["async"]["checkouts"] >= 1
+    assert stats["sync"]["max_overflow"] == settings.db_max_overflow
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, select
+
+from app.database import base, base_class
+from app.models.organization import Organization
+from app.models.user import ActivityLog, User
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def migrated(tmp_path):
+    """A scratch SQLite database at the head revision, and its alembic config."""
+    url = f"sqlite:///{tmp_path}/migrations.db"
+    engine = create_engine(url)
+    for metadata in (base.Base.metadata, base_class.Base.metadata):
+        metadata.create_all(engine)
+    config = Config()
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    config.set_main_option("sqlalchemy.url", url)
+    command.stamp(config, "head")
+    yield engine, config
+    engine.dispose()
+
+
+def _indexes(engine, table: str) -> set:
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+def test_list_query_indexes_round_trip(migrated):
+    engine, config = migrated
+    # create_all names no foreign keys, so step around the users.organization_id migrations
+    command.downgrade(config, "f3c91a7b2e48")
+    command.stamp(config, "c81f4e2a9d37")
+    command.downgrade(config, "3f9b1c7d2a64")
+    assert "ix_sponsors_org_relevance" not in _indexes(engine, "sponsors")
+    assert "ix_activity_logs_user_timestamp" not in _indexes(engine, "activity_logs")
+
+    command.upgrade(config, "c81f4e2a9d37")
+    assert "ix_sponsors_org_relevance" in _indexes(engine, "sponsors")
+    assert "ix_activity_logs_user_timestamp" in _indexes(engine, "activity_logs")
+
+
+def test_activity_organization_is_backfilled_from_users(migrated):
+    engine, config = migrated
+    command.downgrade(config, "f3c91a7b2e48")
+    assert "organization_id" not in {column["name"] for column in inspect(engine).get_columns("activity_logs")}
+    with engine.begin() as conn:
+        conn.execute(Organization.__table__.insert(), [{"id": 5, "name": "Aco"}])
+        conn.execute(User.__table__.insert(), [
+            {"id": 1, "email": "a@aco.example", "full_name": "A", "hashed_password": "x", "organization_id": 5},
+            {"id": 2, "email": "b@example.com", "full_name": "B", "hashed_password": "x", "organization_id": None},
+        ])
+        conn.execute(ActivityLog.__table__.insert(), [
+            {"user_id": 1, "action": "LOGIN"}, {"user_id": 2, "action": "LOGIN"},
+        ])
+
+    command.upgrade(config, "head")
+    assert "ix_activity_logs_org_timestamp" in _indexes(engine, "activity_logs")
+    with engine.connect() as conn:
+        rows = conn.execute(select(ActivityLog.user_id, ActivityLog.organization_id).order_by(ActivityLog.user_id))
+        assert rows.all() == [(1, 5), (2, None)]
@@ -0,0 +1,28 @@
+import time
+
+import fakeredis
+import pytest
+
+from app.core.revocation import MemoryRevocationStore, RedisRevocationStore, RevocationList
+
+
+def _redis_store():
+    store = RedisRevocationStore("redis://unused")
+    store._redis = fakeredis.FakeRedis(decode_responses=True)
+    return store
+
+
+@pytest.mark.parametrize("make_store", [MemoryRevocationStore, _redis_store])
+def test_only_the_first_claim_wins_across_workers(make_store):
+    store = make_store()
+    expires_at = time.time() + 60
+    # Two workers whose local views never synced each other's writes
+    first = RevocationList(store, sync_seconds=3600)
+    second = RevocationList(store, sync_seconds=3600)
+    first.sync()
+    second.sync()
+
+    assert first.claim("jti:a", expires_at)
+    assert not second.is_revoked("jti:a")
+    assert not second.claim("jti:a", expires_at)
+    assert second.is_revoked("jti:a")
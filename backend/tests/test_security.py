@@ -0,0 +1,36 @@
+from passlib.context import CryptContext
+
+from app.core import security
+
+
+def test_rehash_only_raises_the_bcrypt_cost(monkeypatch):
+    monkeypatch.setattr(security, "pwd_context", CryptContext(schemes=["bcrypt"], deprecated="auto"))
+    security.set_bcrypt_rounds(5)
+    cheap = security.get_password_hash("secret")
+    security.set_bcrypt_rounds(6)
+    costly = security.get_password_hash("secret")
+
+    assert security.needs_rehash(cheap)
+    assert not security.needs_rehash(costly)
+    # A worker that calibrated lower leaves the costlier hash alone
+    security.set_bcrypt_rounds(5)
+    assert not security.needs_rehash(costly)
+    assert security.verify_password("secret", costly)
+
+
+def test_login_upgrades_a_cheaper_hash(client, db, monkeypatch):
+    from app.models.user import User
+
+    monkeypatch.setattr(security, "pwd_context", CryptContext(schemes=["bcrypt"], deprecated="auto"))
+    security.set_bcrypt_rounds(4)
+    user = User(email="lead@example.com", full_name="Lead", hashed_password=security.get_password_hash("secret"))
+    db.add(user)
+    db.commit()
+    security.set_bcrypt_rounds(5)
+
+    response = client.post("/api/v1/auth/login", json={"email": "lead@example.com", "password": "secret"})
+    assert response.status_code == 200
+
+    db.refresh(user)  # the rehash runs as a background task before the response completes
+    assert not security.needs_rehash(user.hashed_password)
+    assert security.verify_password("secret", user.hashed_password)
@@ -0,0 +1,88 @@
+import json
+
+from app.config import settings
+from app.models.sponsor import Sponsor
+from app.services import sponsor_import
+
+IMPORT_URL = "/api/v1/sponsors/import"
+
+
+def test_chunk_that_keeps_conflicting_is_reported_not_raised(client, db, login_as, monkeypatch):
+    db.add(Sponsor(name="Taken", contact_email="taken@example.com", organization_id=5))
+    db.commit()
+    login_as(organization_id=5)
+    monkeypatch.setattr(settings, "sponsor_import_chunk_size", 1)
+
+    # A concurrent writer the existence check never sees: both attempts hit the unique name
+    async def nothing_taken(self, batch):
+        return set(), set()
+    monkeypatch.setattr(sponsor_import._Import, "_existing", nothing_taken)
+
+    body = "\n".join(json.dumps(row) for row in [
+        {"name": "Taken", "contact_email": "new@example.com"},
+        {"name": "Fresh", "contact_email": "fresh@example.com"},
+    ])
+    response = client.post(IMPORT_URL, content=body, headers={"Content-Type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["received"], report["imported"], report["failed"]) == (2, 1, 1)
+    assert report["errors"] == [{"row": 1, "error": "Sponsor conflicts with a concurrent write"}]
+
+
+def test_retried_chunk_reports_each_row_once(client, db, login_as, monkeypatch):
+    db.add_all([
+        Sponsor(name="Taken", contact_email="taken@example.com", organization_id=5),
+        Sponsor(name="Racer", contact_email="racer@example.com", organization_id=5),
+    ])
+    db.commit()
+    login_as(organization_id=5)
+
+    # The first existence check misses "Racer", as if it were written concurrently;
+    # the INSERT then conflicts and the retry sees it
+    existing = sponsor_import._Import._existing
+    calls = []
+
+    async def first_check_misses_racer(self, batch):
+        calls.append(batch)
+        emails, names = await existing(self, batch)
+        return (emails, names - {"Racer"}) if len(calls) == 1 else (emails, names)
+    monkeypatch.setattr(sponsor_import._Import, "_existing", first_check_misses_racer)
+
+    body = "\n".join(json.dumps(row) for row in [
+        {"name": "New", "contact_email": "taken@example.com"},
+        {"name": "Racer", "contact_email": "other@example.com"},
+        {"name": "Fresh", "contact_email": "fresh@example.com"},
+    ])
+    response = client.post(IMPORT_URL, content=body, headers={"Content-Type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    assert len(calls) == 2
+    report = response.json()
+    assert (report["received"], report["imported"], report["failed"]) == (3, 1, 2)
+    assert report["errors"] == [
+        {"row": 1, "error": "Sponsor with this email already exists"},
+        {"row": 2, "error": "Sponsor with this name already exists"},
+    ]
+
+
+def test_csv_import_reports_bad_and_duplicate_rows_by_line(client, db, login_as):
+    db.add(Sponsor(name="Taken", contact_email="taken@example.com", organization_id=5))
+    db.commit()
+    login_as(organization_id=5)
+
+    body = "\r\n".join([
+        "name,contact_email,tier,notes",
+        'Fresh,fresh@example.com,Gold,"multi-line',
+        'notes"',
+        "Broken,not-an-email,,",
+        "Taken,other@example.com,,",
+        "Again,fresh@example.com,,",
+    ])
+    response = client.post(IMPORT_URL, content=body.encode("utf-8-sig"), headers={"Content-Type": "text/csv"})
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["received"], report["imported"], report["failed"]) == (4, 1, 3)
+    assert [error["row"] for error in report["errors"]] == [4, 5, 6]
+    assert db.query(Sponsor).filter(Sponsor.name == "Fresh").one().notes == "multi-line\nnotes"
@@ -0,0 +1,122 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.database.session import SessionLocal
+from app.models.sponsor import Sponsor, SponsorStatus
+from app.services import sponsor_matcher
+
+MATCH_URL = "/api/v1/sponsors/match"
+
+
+@pytest.fixture
+def two_organizations(db):
+    db.add_all([
+        Sponsor(name="Aco", organization_id=5, contact_email="a@aco.com", industry="Music",
+                notes="music festival concerts", status=SponsorStatus.ACTIVE),
+        Sponsor(name="Dormant", organization_id=5, contact_email="d@dormant.com", industry="Music",
+                notes="music festival concerts", status=SponsorStatus.INACTIVE),
+        Sponsor(name="Bco", organization_id=6, contact_email="b@bco.com", industry="Music",
+                notes="music festival concerts", status=SponsorStatus.ACTIVE),
+    ])
+    db.commit()
+
+
+@pytest.mark.parametrize("engine", ["tfidf", "index", "ann"])
+def test_match_only_returns_own_organization(client, login_as, two_organizations, engine, monkeypatch):
+    monkeypatch.setattr(settings, "ann_exact_max_candidates", 0)  # keep "ann" on the IVF-PQ path
+    login_as(organization_id=5)
+    payload = {"event_name": "Music Festival", "keywords": ["music"], "engine": engine}
+
+    response = client.post(MATCH_URL, json=payload)
+    assert response.status_code == 200
+    assert [match["sponsor_name"] for match in response.json()] == ["Aco"]
+
+    response = client.post(f"{MATCH_URL}/batch", json=[payload, {**payload, "top_k": None}])
+    assert response.status_code == 200
+    for result in response.json():
+        assert [match["sponsor_name"] for match in result["matches"]] == ["Aco"]
+
+
+@pytest.mark.parametrize("engine", ["tfidf", "index"])
+def test_streamed_match_only_returns_own_organization(client, login_as, two_organizations, engine):
+    login_as(organization_id=6)
+    response = client.post(
+        MATCH_URL,
+        json={"event_name": "Music Festival", "engine": engine, "top_k": None},
+        headers={"Accept": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert [json.loads(line)["sponsor_name"] for line in response.text.splitlines()] == ["Bco"]
+
+
+def test_match_results_are_cached_until_the_organization_writes(client, db, login_as, two_organizations):
+    login_as(organization_id=5)
+    payload = {"event_name": "Music Festival", "keywords": ["music"], "engine": "tfidf"}
+    hits = client.get(f"{MATCH_URL}/cache-stats").json()["hits"]
+
+    assert [match["sponsor_name"] for match in client.post(MATCH_URL, json=payload).json()] == ["Aco"]
+    assert [match["sponsor_name"] for match in client.post(MATCH_URL, json=payload).json()] == ["Aco"]
+    assert client.get(f"{MATCH_URL}/cache-stats").json()["hits"] == hits + 1
+
+    aco = db.query(Sponsor).filter(Sponsor.name == "Aco").one()
+    assert client.delete(f"/api/v1/sponsors/{aco.id}").status_code == 204
+    assert client.post(MATCH_URL, json=payload).json() == []
+
+    client.post("/api/v1/sponsors/", json={
+        "name": "Cco", "contact_email": "c@cco.com", "notes": "music festival stages", "status": "active",
+    })
+    assert [match["sponsor_name"] for match in client.post(MATCH_URL, json=payload).json()] == ["Cco"]
+
+
+def test_small_organization_gets_top_k_from_the_ann_engine(client, db, login_as):
+    words = ["music", "sports", "film", "food", "tech", "travel", "fashion", "books"]
+    # A large tenant fills most of the shared index and its IVF lists
+    db.add_all([
+        Sponsor(name=f"Big {n}", organization_id=6, contact_email=f"big{n}@example.com",
+                notes=f"{words[n % 8]} {words[n * 3 % 8]} partner {n}", status=SponsorStatus.ACTIVE)
+        for n in range(3000)
+    ] + [
+        Sponsor(name=f"Small {n}", organization_id=5, contact_email=f"small{n}@example.com",
+                notes=f"{words[n % 8]} sponsor", status=SponsorStatus.ACTIVE)
+        for n in range(12)
+    ])
+    db.commit()
+    login_as(organization_id=5)
+
+    payload = {"event_name": "Music Festival", "keywords": ["music"], "top_k": 10, "nprobe": 1}
+    ann = client.post(MATCH_URL, json={**payload, "engine": "ann"}).json()
+    exact = client.post(MATCH_URL, json={**payload, "engine": "index"}).json()
+    assert len(ann) == 10
+    assert [match["sponsor_id"] for match in ann] == [match["sponsor_id"] for match in exact]
+
+
+def test_index_picks_up_other_workers_writes_after_the_refresh_window(db, two_organizations, monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(sponsor_matcher, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    cache = sponsor_matcher._IndexCache(refresh_seconds=5.0)
+    assert list(cache.get(db, 5)[1]) == ["Aco"]
+
+    # Written through another session, as another worker would, so nothing invalidates this cache
+    other = SessionLocal()
+    other.add(Sponsor(name="Newco", organization_id=5, contact_email="n@newco.com", status=SponsorStatus.ACTIVE))
+    other.commit()
+    other.close()
+
+    clock.now += 4.9
+    assert list(cache.get(db, 5)[1]) == ["Aco"]
+    clock.now += 0.2
+    assert list(cache.get(db, 5)[1]) == ["Aco", "Newco"]
+
+
+def test_tfidf_matches_explain_themselves(client, login_as, two_organizations):
+    login_as(organization_id=5)
+    response = client.post(MATCH_URL, json={"event_name": "Music Festival", "keywords": ["concerts"], "engine": "tfidf"})
+    assert response.status_code == 200
+    [match] = response.json()
+    terms = [reason["term"] for reason in match["match_reasons"]]
+    assert terms and set(terms) <= {"music", "festival", "concerts"}
+    weights = [reason["weight"] for reason in match["match_reasons"]]
+    assert weights == sorted(weights, reverse=True)
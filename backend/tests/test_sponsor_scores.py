@@ -0,0 +1,39 @@
+import time
+
+from app.models.organization import Organization
+from app.models.sponsor import Sponsor
+
+SCORES_URL = "/api/v1/sponsors/update-scores"
+
+
+def test_update_scores_uses_organization_profile(client, login_as, db):
+    db.add(Organization(id=5, name="Festivals Inc", description="music festivals and concerts"))
+    db.add_all([
+        Sponsor(name="Aco", organization_id=5, contact_email="a@aco.com", notes="music festival concerts"),
+        Sponsor(name="Bco", organization_id=5, contact_email="b@bco.com", notes="insurance and banking"),
+        Sponsor(name="Other", organization_id=6, contact_email="o@other.com", notes="music festival concerts"),
+    ])
+    db.commit()
+    login_as(organization_id=5)
+
+    response = client.post(SCORES_URL)
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    deadline = time.monotonic() + 60
+    while True:
+        job = client.get(f"{SCORES_URL}/{job_id}").json()
+        if job["status"] in ("completed", "failed") or time.monotonic() > deadline:
+            break
+        time.sleep(0.1)
+    assert job["status"] == "completed"
+    assert job["total"] == 2
+
+    scores = dict(db.query(Sponsor.name, Sponsor.relevance_score).all())
+    assert scores["Aco"] > scores["Bco"]
+    assert scores["Other"] == 0.0
+
+
+def test_update_scores_without_organization(client, login_as):
+    login_as(organization_id=7)
+    assert client.post(SCORES_URL).status_code == 404
@@ -0,0 +1,18 @@
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.core.pagination import encode_cursor, keyset_page
+from app.models.sponsor import Sponsor
+from app.services.sponsor_search import apply_search
+
+
+def test_postgres_rank_is_paged_at_double_precision():
+    query, rank = apply_search(select(Sponsor), "music festival", "postgresql")
+    query = keyset_page(query.add_columns(rank), [rank, Sponsor.id], encode_cursor(0.1, 7), 20)
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    # ts_rank_cd is float4; the cursor value is bound as float8
+    cast_rank = "CAST(ts_rank_cd("
+    assert sql.count(cast_rank) == 3  # selected, compared and ordered by
+    assert "ts_rank_cd(" not in sql.replace(cast_rank, "")
+    assert sql.count("AS FLOAT(53))") == 3
@@ -0,0 +1,119 @@
+SPONSORS_URL = "/api/v1/sponsors/"
+
+
+def test_create_and_update_sponsor(client, login_as):
+    login_as(organization_id=5)
+
+    response = client.post(SPONSORS_URL, json={
+        "name": "Aco", "contact_email": "a@aco.example", "tier": "Gold", "status": "active",
+    })
+    assert response.status_code == 201
+    sponsor = response.json()
+    assert sponsor["tier"] == "Gold" and sponsor["status"] == "active"
+
+    response = client.put(f"{SPONSORS_URL}{sponsor['id']}", json={"tier": "Platinum"})
+    assert response.status_code == 200
+    assert response.json()["tier"] == "Platinum"
+
+    response = client.get(f"{SPONSORS_URL}{sponsor['id']}")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Aco"
+
+
+def test_bulk_upsert_returns_rows_in_request_order(client, login_as):
+    login_as(organization_id=5)
+    first = [{"name": f"Sponsor {n}", "contact_email": f"s{n}@example.com"} for n in range(0, 30, 2)]
+    assert client.put(f"{SPONSORS_URL}bulk", json=first).status_code == 200
+
+    # Replacements and inserts interleaved, in an order unrelated to the ids
+    items = [
+        {"name": f"Sponsor {n}", "contact_email": f"s{n}@example.com", "tier": "Gold"}
+        for n in reversed(range(30))
+    ]
+    response = client.put(f"{SPONSORS_URL}bulk", json=items)
+    assert response.status_code == 200
+    rows = response.json()
+    assert [row["contact_email"] for row in rows] == [item["contact_email"] for item in items]
+    assert {row["tier"] for row in rows} == {"Gold"}
+    assert len({row["id"] for row in rows}) == 30
+
+
+def test_bulk_upsert_of_nothing_is_a_no_op(client, login_as):
+    login_as(organization_id=5)
+    response = client.put(f"{SPONSORS_URL}bulk", json=[])
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_bulk_upsert_requires_an_organization(client, login_as):
+    login_as(organization_id=None)
+    item = {"name": "Aco", "contact_email": "a@aco.example"}
+    # A NULL organization never hits the ON CONFLICT target, so replacing would silently duplicate
+    response = client.put(f"{SPONSORS_URL}bulk", json=[item])
+    assert response.status_code == 400
+
+
+def test_list_pages_by_relevance_and_filters(client, db, login_as):
+    from app.models.sponsor import Sponsor, SponsorStatus
+
+    db.add_all([
+        Sponsor(name=f"Sponsor {n}", contact_email=f"s{n}@example.com", organization_id=5,
+                relevance_score=n % 3, status=SponsorStatus.ACTIVE if n % 2 else SponsorStatus.PENDING)
+        for n in range(7)
+    ] + [Sponsor(name="Elsewhere", contact_email="e@example.com", organization_id=6)])
+    db.commit()
+    login_as(organization_id=5)
+
+    seen, cursor = [], None
+    while True:
+        page = client.get(SPONSORS_URL, params={"limit": 3, **({"cursor": cursor} if cursor else {})}).json()
+        # The response has no relevance_score; "Sponsor n" was given n % 3
+        seen += [(int(sponsor["name"].split()[1]) % 3, sponsor["id"]) for sponsor in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == 7
+    assert seen == sorted(seen, reverse=True)
+
+    response = client.get(SPONSORS_URL, params={"status": "active"})
+    assert response.status_code == 200
+    assert {sponsor["name"] for sponsor in response.json()["items"]} == {"Sponsor 1", "Sponsor 3", "Sponsor 5"}
+
+
+def test_search_ranks_name_matches_first_within_the_organization(client, db, login_as):
+    from app.models.sponsor import Sponsor
+
+    db.add_all([
+        Sponsor(name="Acme", contact_email="a@example.com", organization_id=5, notes="sponsors running festivals"),
+        Sponsor(name="Festival Foods", contact_email="f@example.com", organization_id=5, industry="Catering"),
+        Sponsor(name="Quiet Co", contact_email="q@example.com", organization_id=5, notes="books"),
+        Sponsor(name="Festival Elsewhere", contact_email="e@example.com", organization_id=6),
+    ])
+    db.commit()
+    login_as(organization_id=5)
+
+    response = client.get(SPONSORS_URL, params={"search": "festival"})
+    assert response.status_code == 200
+    assert [sponsor["name"] for sponsor in response.json()["items"]] == ["Festival Foods", "Acme"]
+
+    # Query syntax is treated as plain words
+    assert client.get(SPONSORS_URL, params={"search": 'festival OR "books'}).status_code == 200
+
+
+def test_bulk_patch_updates_all_or_nothing(client, login_as):
+    login_as(organization_id=5)
+    created = client.put(f"{SPONSORS_URL}bulk", json=[
+        {"name": f"Sponsor {n}", "contact_email": f"s{n}@example.com"} for n in range(3)
+    ]).json()
+    ids = [sponsor["id"] for sponsor in created]
+
+    patches = [{"id": ids[2], "tier": "Gold"}, {"id": ids[0], "notes": "renewed", "status": "active"}]
+    response = client.patch(f"{SPONSORS_URL}bulk", json=patches)
+    assert response.status_code == 200
+    assert [sponsor["id"] for sponsor in response.json()] == [ids[2], ids[0]]
+    assert response.json()[0]["tier"] == "Gold"
+    assert response.json()[1]["status"] == "active" and response.json()[1]["tier"] == "Bronze"
+
+    login_as(organization_id=6)
+    assert client.patch(f"{SPONSORS_URL}bulk", json=[{"id": ids[1], "notes": "taken over"}]).status_code == 404
+    assert client.patch(f"{SPONSORS_URL}bulk", json=[{"id": ids[1]}, {"id": ids[1]}]).status_code == 400
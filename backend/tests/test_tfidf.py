@@ -0,0 +1,11 @@
+from app.ai_engine.tfidf import TfidfIndex
+
+
+def test_scores_are_cosine_similarities_over_shared_terms():
+    index = TfidfIndex([7, 8, 9], ["music festival concerts", "banking fintech", "music streaming"])
+    scores = index.score("Music festival")
+
+    assert scores.shape == (3,)
+    assert scores[0] > scores[2] > 0
+    assert scores[1] == 0
+    assert TfidfIndex([], []).score("music").shape == (0,)
@@ -0,0 +1,100 @@
+import pytest
+
+from app.core.security import get_password_hash
+from app.models.organization import Organization
+from app.models.user import ActivityLog, User
+
+USERS_URL = "/api/v1/users/"
+
+
+@pytest.fixture
+def users(db):
+    db.add_all([Organization(id=5, name="Aco"), Organization(id=6, name="Bco")])
+    members = [
+        User(email=f"member{n}@aco.example", full_name=f"Member {n}", hashed_password="x", organization_id=5)
+        for n in range(5)
+    ]
+    outsider = User(email="other@bco.example", full_name="Other", hashed_password="x", organization_id=6)
+    db.add_all(members + [outsider])
+    db.flush()
+    db.add_all([
+        ActivityLog(user_id=members[1].id, organization_id=5, action="LOGIN"),
+        ActivityLog(user_id=outsider.id, organization_id=6, action="LOGIN"),
+    ])
+    db.commit()
+    return members, outsider
+
+
+def test_admin_lists_own_organization_page_by_page(client, login_as, users):
+    members, _ = users
+    login_as(user_id=members[0].id, organization_id=5, is_admin=True)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get(USERS_URL, params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        seen += [user["id"] for user in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [member.id for member in members]
+
+
+def test_get_user_includes_organization_and_checks_tenant(client, login_as, users):
+    members, outsider = users
+    login_as(user_id=members[0].id, organization_id=5)
+
+    response = client.get(f"{USERS_URL}{members[1].id}")
+    assert response.status_code == 200
+    assert response.json()["organization_name"] == "Aco"
+    assert client.get(f"{USERS_URL}{outsider.id}").status_code == 403
+
+
+def test_admin_updates_and_deactivates_only_own_organization(client, db, login_as, users):
+    members, outsider = users
+    login_as(user_id=members[0].id, organization_id=5, is_admin=True)
+
+    response = client.put(f"{USERS_URL}{members[1].id}", json={"full_name": "Renamed"})
+    assert response.status_code == 200
+    assert response.json()["full_name"] == "Renamed"
+    assert client.put(f"{USERS_URL}{outsider.id}", json={"full_name": "Renamed"}).status_code == 404
+
+    assert client.delete(f"{USERS_URL}{members[2].id}").status_code == 204
+    assert client.delete(f"{USERS_URL}{outsider.id}").status_code == 404
+    db.expire_all()
+    assert db.get(User, members[2].id).is_active is False
+    assert db.get(User, outsider.id).is_active is True
+
+
+def test_organization_activity_is_scoped(client, login_as, users):
+    members, _ = users
+    login_as(user_id=members[0].id, organization_id=5, is_admin=True)
+
+    response = client.get(f"{USERS_URL}organization/activity")
+    assert response.status_code == 200
+    assert [activity["user_id"] for activity in response.json()["items"]] == [members[1].id]
+
+
+def test_organization_activity_is_recorded_with_the_actors_organization(client, db, login_as, users):
+    members, _ = users
+    members[3].hashed_password = get_password_hash("secret")
+    db.commit()
+    login_as(user_id=members[3].id, organization_id=5)
+    response = client.post(
+        f"{USERS_URL}me/change-password", json={"old_password": "secret", "new_password": "new-secret"}
+    )
+    assert response.status_code == 200
+
+    # moving organizations later leaves the history with the organization it happened in
+    members[3].organization_id = 6
+    db.commit()
+    login_as(user_id=members[0].id, organization_id=5, is_admin=True)
+
+    response = client.get(f"{USERS_URL}organization/activity")
+    assert [(activity["user_id"], activity["action"]) for activity in response.json()["items"]] == [
+        (members[3].id, "UPDATE_PASSWORD"), (members[1].id, "LOGIN"),
+    ]
@@ -0,0 +1,84 @@
+import json
+import os
+
+import numpy as np
+
+from app.ai_engine.vector_index import SponsorVectorIndex
+
+
+def _vectors(n: int, dim: int = 8, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).random((n, dim)).astype(np.float32)
+
+
+def test_growth_swaps_both_arrays_in_one_generation(tmp_path):
+    writer = SponsorVectorIndex(str(tmp_path), 8)
+    reader = SponsorVectorIndex(str(tmp_path), 8)
+    vectors = _vectors(1500)
+    for sponsor_id, vector in enumerate(vectors, start=1):
+        writer.upsert(sponsor_id, vector)
+
+    with open(tmp_path / "meta.json") as f:
+        meta = json.load(f)
+    # Retired generations are removed; meta.json names the only one left
+    assert sorted(os.listdir(tmp_path)) == sorted(["index.lock", "meta.json", meta["data"]])
+
+    ids, mapped = reader.snapshot()
+    assert len(ids) == 1500
+    np.testing.assert_array_equal(mapped[ids == 700][0], vectors[699])
+
+
+def test_upsert_and_delete_find_rows_by_id(tmp_path):
+    index = SponsorVectorIndex(str(tmp_path), 8)
+    index.upsert_many(range(1, 11), _vectors(10))
+    index.upsert_many([3, 11], np.ones((2, 8), np.float32))
+    index.delete(4)
+
+    ids, vectors = index.snapshot()
+    assert len(index) == 10
+    assert 4 not in ids
+    np.testing.assert_array_equal(vectors[ids == 3][0], np.ones(8, np.float32))
+    np.testing.assert_array_equal(vectors[ids == 11][0], np.ones(8, np.float32))
+
+    # Compaction renumbers rows; lookups by id still land on the right one
+    for sponsor_id in range(1, 5):
+        index.delete(sponsor_id)
+    index.upsert(10, np.full(8, 2.0, np.float32))
+    ids, vectors = index.snapshot()
+    np.testing.assert_array_equal(vectors[ids == 10][0], np.full(8, 2.0, np.float32))
+    assert len(index) == 7
+
+
+def test_in_place_overwrites_leave_meta_alone(tmp_path):
+    writer = SponsorVectorIndex(str(tmp_path), 8)
+    reader = SponsorVectorIndex(str(tmp_path), 8)
+    writer.upsert_many(range(1, 11), _vectors(10))
+    meta_stat = os.stat(tmp_path / "meta.json")
+
+    writer.upsert(3, np.ones(8, np.float32))
+    writer.upsert_many([5, 3], np.full((2, 8), 2.0, np.float32))
+
+    # Readers keep their mapping and still learn which rows changed
+    assert os.stat(tmp_path / "meta.json").st_mtime_ns == meta_stat.st_mtime_ns
+    assert os.stat(tmp_path / "meta.json").st_ino == meta_stat.st_ino
+    assert reader.updated_rows() == [2, 4, 2]
+    ids, vectors = reader.snapshot()
+    np.testing.assert_array_equal(vectors[ids == 5][0], np.full(8, 2.0, np.float32))
+
+    # Renumbering rows starts the next epoch with an empty log
+    for sponsor_id in range(1, 5):
+        writer.delete(sponsor_id)
+    assert reader.epoch == 1
+    assert reader.updated_rows() == []
+    assert not any(name.startswith("updates-") for name in os.listdir(tmp_path))
+
+
+def test_upsert_many_keeps_the_last_vector_of_a_repeated_id(tmp_path):
+    index = SponsorVectorIndex(str(tmp_path), 8)
+    index.upsert_many([1, 2, 1], np.stack([np.full(8, value, np.float32) for value in (1.0, 2.0, 3.0)]))
+    index.upsert_many([2, 2], np.stack([np.full(8, value, np.float32) for value in (4.0, 5.0)]))
+
+    ids, vectors = index.snapshot()
+    assert len(index) == 2
+    assert sorted(ids.tolist()) == [1, 2]
+    np.testing.assert_array_equal(vectors[ids == 1][0], np.full(8, 3.0, np.float32))
+    np.testing.assert_array_equal(vectors[ids == 2][0], np.full(8, 5.0, np.float32))